@@ -1,11 +1,16 @@
-import tarfile, io, subprocess, math, os, random, re, shutil, requests, webbrowser, zipfile, stat, json, git, time, platform
+import tarfile, io, csv, hashlib, subprocess, math, os, sys, random, re, shutil, requests, webbrowser, zipfile, stat, json, git, time, platform, threading, errno, ctypes, fnmatch
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PyQt6.QtGui import QColor, QPixmap, QDesktopServices
 from PyQt6.QtCore import QUrl, Qt, QTimer, QProcess, QThread, pyqtSignal, QPoint
-from PyQt6.QtWidgets import QSplashScreen, QInputDialog, QMenu, QSplitter, QListWidgetItem, QScrollArea, QFrame, QProgressDialog, QHBoxLayout, QFileDialog, QMessageBox, QApplication, QCheckBox, QLineEdit, QDialog, QLabel, QPushButton, QComboBox, QGridLayout, QWidget, QVBoxLayout, QSpinBox
-from git import Repo, GitCommandError
+from PyQt6.QtWidgets import QSplashScreen, QInputDialog, QMenu, QSplitter, QListWidgetItem, QScrollArea, QFrame, QProgressDialog, QProgressBar, QHBoxLayout, QFileDialog, QMessageBox, QApplication, QCheckBox, QLineEdit, QDialog, QLabel, QPushButton, QComboBox, QGridLayout, QWidget, QVBoxLayout, QSpinBox
+from git import Repo, GitCommandError, InvalidGitRepositoryError, NoSuchPathError
 from packaging.version import Version
-import pandas as pd
 
 
 ############################################################
@@ -16,6 +21,10 @@ DATE = "2025/01/19"
 ITERATION = "29"
 VERSION = Version("1.8.1")  # Current version of the Modpack Manager
 
+# Never copied into the game's Mods folder: version control, editor and documentation files (see is_ignored)
+DEFAULT_INSTALL_IGNORE = [".git", ".github", ".gitignore", ".gitattributes", ".gitmodules", ".vscode", ".idea",
+                          ".DS_Store", "Thumbs.db", "desktop.ini", "README*", "*.md", "screenshots"]
+
 system_platform = platform.system()
 
 if system_platform == "Windows":
@@ -30,6 +39,12 @@ if system_platform == "Windows":
         "remove_mods": True,
         "skip_mod_selection": False,
         "auto_install": False,
+        "clone_strategy": "full",
+        "submodule_jobs": 8,
+        "install_mode": "reflink",
+        "install_generations": 2,
+        "deduplicate_mods": True,
+        "install_ignore": list(DEFAULT_INSTALL_IGNORE),
     }
 
 elif system_platform == "Linux":
@@ -44,6 +59,12 @@ elif system_platform == "Linux":
         "remove_mods": True,
         "skip_mod_selection": False,
         "auto_install": False,
+        "clone_strategy": "full",
+        "submodule_jobs": 8,
+        "install_mode": "reflink",
+        "install_generations": 2,
+        "deduplicate_mods": True,
+        "install_ignore": list(DEFAULT_INSTALL_IGNORE),
     }
 
 elif system_platform == "Darwin":
@@ -58,6 +79,12 @@ elif system_platform == "Darwin":
         "remove_mods": True,
         "skip_mod_selection": False,
         "auto_install": False,
+        "clone_strategy": "full",
+        "submodule_jobs": 8,
+        "install_mode": "reflink",
+        "install_generations": 2,
+        "deduplicate_mods": True,
+        "install_ignore": list(DEFAULT_INSTALL_IGNORE),
     }
     
 SETTINGS_FILE = os.path.join(SETTINGS_FOLDER, "user_settings.json")
@@ -66,11 +93,85 @@ FAVORITES_FILE = os.path.join(SETTINGS_FOLDER, "favorites.json")
 PRESETS_FILE = os.path.join(SETTINGS_FOLDER, "modpack_presets.json")
 CACHE_FILE = os.path.join(SETTINGS_FOLDER, "modpack_cache.json")
 CSV_CACHE_FILE = os.path.join(SETTINGS_FOLDER, "cached_data.csv")
+METADATA_INDEX_FILE = os.path.join(SETTINGS_FOLDER, "cached_data_index.json")  # Compiled form of CSV_CACHE_FILE
+HTTP_CACHE_FILE = os.path.join(SETTINGS_FOLDER, "http_cache.json")  # Validators and fetch times per URL
+TRANSFER_LOG_FILE = os.path.join(SETTINGS_FOLDER, "transfer_log.jsonl")  # One JSON line per git transfer
+TRANSFER_LOG_MAX_SIZE = 1024 * 1024  # Rotated to transfer_log.jsonl.1 beyond this size
+INSTALL_STATS_FILE = os.path.join(SETTINGS_FOLDER, "install_stats.json")  # Measured install throughput and mod sizes
+PENDING_DELETIONS_FILE = os.path.join(SETTINGS_FOLDER, "pending_deletions.json")  # Tombstoned folders not deleted yet
+
+# Seconds a cached resource is used without contacting the server at all
+MODPACK_DATA_TTL = 10 * 60
+CSV_DATA_TTL = 60 * 60
+LOGO_TTL = 7 * 24 * 60 * 60
 
 LOGO_URL = "https://raw.githubusercontent.com/Dimserene/Dimserenes-Modpack/refs/heads/main/NewFullPackLogo%20New%20Year.png"
 LOGO_PATH =  os.path.join(SETTINGS_FOLDER, "logoNewYear.png")  # File name to save the downloaded logo
 
 MODPACKS_FOLDER = os.path.join(os.getcwd(), "Modpacks")  # Folder to store downloaded modpacks
+# Bare repository whose objects full clones borrow through git alternates. Deleting it breaks those clones.
+SHARED_OBJECTS_FOLDER = os.path.join(MODPACKS_FOLDER, ".objects")
+# Bare base repositories; every downloaded branch folder is a git worktree of its modpack's base
+MODPACK_REPOS_FOLDER = os.path.join(MODPACKS_FOLDER, ".repos")
+# Content-addressed store: mod files of every modpack are hard links to <store>/<sha1[:2]>/<sha1[2:]>, one copy per content
+BLOB_STORE_FOLDER = os.path.join(MODPACKS_FOLDER, ".blobs")
+BLOB_INDEX_NAME = "index.json"  # In the store: {inode: [size, mtime_ns, sha1]}, so unchanged files are not hashed again
+
+# Clone strategies for modpack downloads: label shown in settings, extra `git clone` arguments
+CLONE_STRATEGIES = {
+    "full": ("Full history", []),
+    "shallow": ("Shallow (latest commit only)", ["--depth", "1"]),
+    "partial": ("Partial (blobless)", ["--filter=blob:none"]),
+    # Mods are fetched as archives of their pinned commits, without git history; git is only used for the pack itself
+    "archive": ("Archives (no mod history, fastest)", ["--depth", "1"]),
+}
+DEFAULT_CLONE_STRATEGY = "full"
+DEFAULT_SUBMODULE_JOBS = 8  # Submodules fetched in parallel
+
+# Archive downloads: mods hosted on GitHub are fetched as tarballs of the commit their gitlink pins
+GITHUB_REPO_PATTERN = re.compile(r"^(?:https?://|git@|ssh://git@)github\.com[/:](?P<owner>[^/]+)/(?P<repo>[^/]+?)(?:\.git)?/?$")
+ARCHIVE_URL_TEMPLATE = "https://codeload.github.com/{owner}/{repo}/tar.gz/{sha}"
+ARCHIVE_MANIFEST_NAME = "mod-archives.json"  # {path: sha} of archive-extracted mods, kept in the checkout's git dir
+REMOTE_HEADS_NAME = "mod-remote-heads.json"  # {path: sha} a download checked out with `submodule update --remote`
+
+# Startup profiling, enabled with MODPACK_MANAGER_PROFILE=1 or the --profile flag
+PROFILE_STARTUP = os.environ.get("MODPACK_MANAGER_PROFILE", "") not in ("", "0") or "--profile" in sys.argv
+PROFILE_TRACE_FILE = os.path.join(SETTINGS_FOLDER, "startup_trace.json")  # Chrome trace-event format
+
+# Kept in the Mods folder: every installed file with its size, mtime and SHA-1, so reinstalls copy only changes
+INSTALL_MANIFEST_NAME = ".modpack_manager_manifest.json"
+
+# How installed files are materialized in the Mods folder: label shown in settings
+INSTALL_MODES = {
+    "reflink": "Copy-on-write clone (btrfs, XFS, APFS)",
+    "hardlink": "Hard links (no extra disk space)",
+    "symlink": "Symlink each mod folder",
+    "copy": "Copy files",
+}
+DEFAULT_INSTALL_MODE = "reflink"  # Behaves exactly like a copy, and is one where the filesystem cannot clone
+MOD_WRITTEN_FILES = ("config.lua", "config.json", "*.jkr")  # Rewritten in place by mods (Talisman, Cryptid); never hard linked
+FICLONE = 0x40049409  # Linux ioctl: share the source file's extents with the destination
+DEFAULT_INSTALL_JOBS = 8  # Files placed in parallel during an install
+
+# Staged installs: built in <Mods>.staging, swapped in by rename; replaced installs are kept as <Mods>.gen-<timestamp>
+STAGING_SUFFIX = ".staging"
+GENERATION_INFIX = ".gen-"
+STAGED_COMPLETE_MARKER = ".install_complete"
+STAGED_PARKED_MARKER = ".parked_install"  # In a staging folder that is still an untouched parked install
+DEFAULT_INSTALL_GENERATIONS = 2  # Previous installs kept for rollback
+PACK_IGNORE_FILE = "install_ignore.json"  # In a modpack's root: {"*": [patterns for every mod], "<mod>": [patterns]}
+
+# Install planning: throughput assumed per install mode until one has been measured, as (bytes/s, files/s)
+DEFAULT_INSTALL_THROUGHPUT = {"copy": (80 * 1024 ** 2, 400), "reflink": (80 * 1024 ** 2, 400),
+                              "hardlink": (10 * 1024 ** 3, 2000), "symlink": (10 * 1024 ** 3, 2000)}
+FREE_SPACE_MARGIN = 64 * 1024 ** 2  # Left free on the Mods drive on top of what an install writes
+PLAN_DETAILS_LIMIT = 2000  # Paths listed in the install summary's details
+
+# Installs of other modpacks are parked next to the Mods folder as <Mods>@<modpack folder>, and swapped back in by rename
+PACK_TREE_SEPARATOR = "@"
+
+# Folders are deleted by renaming them to <folder>.deleting-<timestamp> (a tombstone), then removing them in the background
+TOMBSTONE_INFIX = ".deleting-"
 
 # Ensure the Mods folder and required files exist
 def ensure_settings_folder_exists():
@@ -95,20 +196,29 @@ def set_git_buffer_size():
     try:
         # Increase the buffer size globally
         subprocess.run(['git', 'config', '--global', 'http.postBuffer', '524288000'], check=True)
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
         print(f"Failed to set Git buffer size: {e}")
 
-# Call this function before performing Git operations
-set_git_buffer_size()
-
-def cache_modpack_data(data):
-    """Cache modpack data to a local JSON file."""
+def detect_clone_strategy(repo, fallback=DEFAULT_CLONE_STRATEGY):
+    """Return the clone strategy an existing repository was created with."""
+    if os.path.exists(archive_manifest_path(repo)):
+        return "archive"
     try:
-        with open(CACHE_FILE, "w") as f:
-            json.dump(data, f, indent=4)
-        print("Modpack data cached successfully.")
-    except Exception as e:
-        print(f"Failed to cache modpack data: {e}")
+        if repo.git.rev_parse('--is-shallow-repository') == "true":
+            return "shallow"
+        if repo.git.config('--get', 'remote.origin.partialclonefilter', with_exceptions=False):
+            return "partial"
+        return "full"
+    except GitCommandError:
+        return fallback
+
+def submodule_update_args(strategy):
+    """Extra `git submodule update` arguments that keep submodules on the given clone strategy."""
+    if strategy in ("shallow", "archive"):
+        return ['--depth', '1']
+    if strategy == "partial":
+        return ['--filter=blob:none']
+    return []
 
 def load_cached_modpack_data():
     """Load cached modpack data, with a check for availability."""
@@ -124,16 +234,8 @@ def load_cached_modpack_data():
     return {}
 
 def download_logo(url, save_path):
-    """Download the logo from the given URL."""
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        with open(save_path, "wb") as f:
-            f.write(response.content)
-        print(f"Logo downloaded successfully: {save_path}")
-    except requests.RequestException as e:
-        print(f"Failed to download logo: {e}")
-        exit(1)
+    """Download the logo from the given URL through the HTTP cache. Returns True if a logo is available."""
+    return fetch_cached(url, save_path, LOGO_TTL) is not None
 
 def remove_debug_folders(mods_directory):
     """
@@ -146,143 +248,398 @@ def remove_debug_folders(mods_directory):
             debug_file_path = os.path.join(folder_path, "tk_debug_window.py")
             if os.path.isfile(debug_file_path):
                 print(f"Removing folder: {folder_path}")
-                shutil.rmtree(folder_path)
-
-def is_online(test_url="https://www.google.com", parent=None):
-    """Check if the system is connected to the internet."""
-    try:
-        response = requests.get(test_url, timeout=5)
-        return response.status_code == 200
-    except requests.RequestException:
-        if parent:
-            QMessageBox.warning(parent, "Offline Mode", "Unable to fetch modpack data. Using cached data if available.")
-        return False
+                if os.path.islink(folder_path):
+                    remove_link(folder_path)  # Symlink install mode: leave the modpack's copy alone
+                else:
+                    shutil.rmtree(folder_path)
 
 ############################################################
-# Worker class for downloading/updating modpack in the background
+# Startup profiler (Chrome trace-event output)
 ############################################################
 
-url = "https://raw.githubusercontent.com/Dimserene/ModpackManager/main/information.json"
+class StartupProfiler:
+    """Records wall-clock spans of startup phases and network calls."""
 
-def fetch_modpack_data(url):
-    """Fetch modpack data, with fallback to offline cache if offline."""
-    if is_online():
-        print("Online: Fetching modpack data...")
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.events = []
+        self.lock = threading.Lock()
+        self.reported = False
+
+    def add_span(self, name, start, duration, category="startup", **args):
+        """Record a finished span; `start` and `duration` are perf_counter seconds."""
+        if not self.enabled:
+            return
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start - self.origin) * 1e6),
+            "dur": round(duration * 1e6),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self.lock:
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name, category="startup", **args):
+        """Time the enclosed block as one span."""
+        start = time.perf_counter()
         try:
-            response = requests.get(url)
-            response.raise_for_status()  # Raise exception for HTTP errors
-            data = response.json()       # Parse JSON data
-            cache_modpack_data(data)     # Cache the data for offline use
-            return data
-        except requests.RequestException as e:
-            print(f"Failed to fetch data: {e}")
+            yield
+        finally:
+            self.add_span(name, start, time.perf_counter() - start, category, **args)
+
+    def profiled(self, name=None):
+        """Decorator that records each call of a function as a span."""
+        def decorator(func):
+            span_name = name or func.__name__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def write_report(self):
+        """Write the trace file and print a one-line summary (once per run)."""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+
+        with self.lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        try:
+            with open(PROFILE_TRACE_FILE, "w") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        except OSError as e:
+            print(f"Failed to write startup trace: {e}")
+
+        total_ms = (time.perf_counter() - self.origin) * 1000
+        phases = [f"{event['name']} {event['dur'] / 1000:.0f} ms" for event in events if event["cat"] == "startup"]
+        network = [event for event in events if event["cat"] == "network"]
+        network_ms = sum(event["dur"] for event in network) / 1000
+        print(
+            f"Startup profile: total {total_ms:.0f} ms | " + " | ".join(phases)
+            + f" | network {len(network)} requests {network_ms:.0f} ms | trace: {PROFILE_TRACE_FILE}"
+        )
+
+profiler = StartupProfiler(PROFILE_STARTUP)
+
+############################################################
+# Shared HTTP client (pooled connections, retries, timing stats)
+############################################################
+
+HTTP_TIMEOUT = (5, 30)  # Default (connect, read) timeout in seconds
+
+def create_http_session():
+    """Create a session that keeps connections alive per host and retries transient failures."""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,  # 0.5s, 1s, 2s between attempts
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": f"ModpackManager/{VERSION}"})
+    return session
+
+http_session = create_http_session()
+http_stats = {}  # Host -> {"requests", "failures", "seconds", "bytes"}
+http_stats_lock = threading.Lock()
+
+def record_http_stats(host, seconds, size, failed=False):
+    """Accumulate per-host request timing."""
+    with http_stats_lock:
+        stats = http_stats.setdefault(host, {"requests": 0, "failures": 0, "seconds": 0.0, "bytes": 0})
+        stats["requests"] += 1
+        stats["failures"] += int(failed)
+        stats["seconds"] += seconds
+        stats["bytes"] += size
+
+def get_http_stats():
+    """Return a snapshot of the per-host request timing stats."""
+    with http_stats_lock:
+        return {host: dict(stats) for host, stats in http_stats.items()}
+
+def log_http_stats(label):
+    """Print the per-host request timing collected so far, one line per host."""
+    for host, stats in sorted(get_http_stats().items()):
+        average = stats["seconds"] / max(stats["requests"], 1) * 1000
+        print(f"HTTP {label}: {host}: {stats['requests']} request(s), {stats['failures']} failed, "
+              f"{average:.0f} ms average, {format_bytes(stats['bytes'])}")
+
+def http_get(url, **kwargs):
+    """
+    GET a URL through the shared session with a default timeout.
+    Raises:
+        requests.RequestException: If the request fails after all retries.
+    """
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    host = urlparse(url).netloc
+    start = time.perf_counter()
+    try:
+        response = http_session.get(url, **kwargs)
+    except requests.RequestException as e:
+        elapsed = time.perf_counter() - start
+        record_http_stats(host, elapsed, 0, failed=True)
+        profiler.add_span(f"GET {host}", start, elapsed, "network", url=url, error=str(e))
+        raise
+
+    elapsed = time.perf_counter() - start
+    profiler.add_span(f"GET {host}", start, elapsed, "network", url=url, status=response.status_code)
+    if kwargs.get("stream"):
+        size = int(response.headers.get("content-length", 0) or 0)
     else:
-        print("Offline: Using cached modpack data.")
+        size = len(response.content)
+    record_http_stats(host, elapsed, size, failed=response.status_code >= 400)
+    return response
 
-    # Fallback to cached data if offline
-    return load_cached_modpack_data()
+############################################################
+# HTTP cache for remote resources
+############################################################
 
-modpack_data = fetch_modpack_data(url)
+http_cache_lock = threading.Lock()  # Guards HTTP_CACHE_FILE against concurrent fetches
+
+def load_http_cache_index():
+    """Load the per-URL cache index (validators and fetch times)."""
+    try:
+        with open(HTTP_CACHE_FILE, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def update_http_cache_entry(url, entry):
+    """Store the cache entry for a URL."""
+    with http_cache_lock:
+        index = load_http_cache_index()
+        index[url] = entry
+        try:
+            with open(HTTP_CACHE_FILE + ".tmp", "w") as f:
+                json.dump(index, f, indent=4)
+            os.replace(HTTP_CACHE_FILE + ".tmp", HTTP_CACHE_FILE)
+        except Exception as e:
+            print(f"Failed to save HTTP cache index: {e}")
+
+def read_cache_file(cache_path):
+    """Return the cached body for a resource, or None if there is none."""
+    try:
+        with open(cache_path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
 
-def fetch_dependencies(url):
+def fetch_cached(url, cache_path, ttl, validate=None):
     """
-    Fetch dependencies from the `information.json` file.
+    Fetch a URL through the on-disk HTTP cache.
+    A cached copy younger than `ttl` is returned without any request; otherwise a
+    conditional request (If-None-Match / If-Modified-Since) is sent, so an unchanged
+    resource only costs a 304. The cached copy is also the offline fallback.
     Args:
-        url (str): URL of the `information.json` file.
-        parent (QWidget or None): Optional parent for QMessageBox.
+        url (str): URL of the resource.
+        cache_path (str): File that holds the cached body.
+        ttl (int): Freshness lifetime in seconds.
+        validate (callable or None): Rejects a body (e.g. a captive portal page) when it returns False.
     Returns:
-        dict: Dictionary of dependencies from the JSON file.
+        bytes or None: The resource body, or None if it is neither downloadable nor cached.
     """
-    if is_online():
-        print(f"Fetching dependencies from {url}...")
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            # Cache the dependencies locally
-            cache_modpack_data(data)
-            print("Dependencies fetched successfully:", data.get("dependencies", {}))
-            return data.get("dependencies", {})
-        except requests.RequestException as e:
-            print(f"Failed to fetch dependencies: {e}")
-    else:
-        print("Offline: Using cached dependency data.")
-    
-    # Load cached data as fallback
-    cached_data = load_cached_modpack_data()
-    return cached_data.get("dependencies", {}) if cached_data else {}
-    
-dependencies = fetch_dependencies(url)
+    with http_cache_lock:
+        entry = load_http_cache_index().get(url, {})
+    cached_body = read_cache_file(cache_path)
+
+    if cached_body is not None and time.time() - entry.get("fetched_at", 0) < ttl:
+        print(f"Using fresh cached copy of {url}")
+        return cached_body
+
+    headers = {}
+    if cached_body is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        response = http_get(url, headers=headers)
+        if response.status_code == 304 and cached_body is not None:
+            print(f"Not modified: {url}")
+            entry["fetched_at"] = time.time()
+            update_http_cache_entry(url, entry)
+            return cached_body
+
+        response.raise_for_status()
+        body = response.content
+        if validate and not validate(body):
+            raise ValueError(f"Unexpected response content from {url}")
+
+        with open(cache_path + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(cache_path + ".tmp", cache_path)  # A crash mid-write must not leave a truncated body behind
+        update_http_cache_entry(url, {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "path": cache_path,
+        })
+        print(f"Downloaded and cached: {url}")
+        return body
+    except (requests.RequestException, OSError, ValueError) as e:
+        print(f"Failed to fetch {url}: {e}")
+
+    # Fall back to the stale cached copy, if any
+    return cached_body
+
+def is_json_body(body):
+    """Check that a response body is valid JSON."""
+    try:
+        json.loads(body)
+        return True
+    except ValueError:
+        return False
+
+############################################################
+# Worker class for downloading/updating modpack in the background
+############################################################
+
+url = "https://raw.githubusercontent.com/Dimserene/ModpackManager/main/information.json"
+
+def fetch_modpack_data(url):
+    """Fetch modpack data through the HTTP cache, with fallback to the offline cache."""
+    print("Fetching modpack data...")
+    body = fetch_cached(url, CACHE_FILE, MODPACK_DATA_TTL, validate=is_json_body)
+    if body is None:
+        return {}
+    try:
+        return json.loads(body)
+    except ValueError as e:
+        print(f"Failed to parse modpack data: {e}")
+        return {}
 
 # URL to the public Google Sheet (export as CSV format)
 sheet_url = "https://docs.google.com/spreadsheets/d/1L2wPG5mNI-ZBSW_ta__L9EcfAw-arKrXXVD-43eU4og/export?format=csv&gid=510782711"
 
 # Download and load CSV data
-import io
+def is_csv_body(body):
+    """Reject HTML pages (sign-in or captive portal pages) served in place of the CSV export."""
+    return not body.lstrip().startswith(b"<")
 
 def fetch_csv_data(url, parent=None):
     """
-    Fetch CSV data with fallback to offline mode and caching.
+    Fetch CSV data through the HTTP cache, with fallback to offline mode.
     Args:
         url (str): URL of the CSV file.
         parent (QWidget or None): Optional parent for QMessageBox.
     Returns:
-        pd.DataFrame or None: Pandas DataFrame with CSV data, or None on failure.
+        dict or None: Compiled metadata index (see compile_metadata_index), or None on failure.
     """
-    if is_online():
-        print(f"Fetching CSV data from {url}...")
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            csv_data = response.text
-            
-            # Save the CSV data to cache
-            with open(CSV_CACHE_FILE, "w", encoding="utf-8") as cache_file:
-                cache_file.write(csv_data)
-            print("CSV data cached successfully.")
+    print(f"Fetching CSV data from {url}...")
+    body = fetch_cached(url, CSV_CACHE_FILE, CSV_DATA_TTL, validate=is_csv_body)
+    if body is None:
+        if parent:
+            QMessageBox.warning(parent, "Offline Mode", "Failed to fetch CSV data and no cached data is available.")
+        return None
+    return load_metadata_index(body)
 
-            # Load the data into a DataFrame
-            return pd.read_csv(io.StringIO(csv_data))
+def load_cached_csv_data():
+    """
+    Load the metadata index for the cached CSV file.
+    Returns:
+        dict or None: Compiled metadata index, or None if no cached CSV is available.
+    """
+    body = read_cache_file(CSV_CACHE_FILE)
+    if body is None:
+        print("No cached CSV data found.")
+        return None
+    print("Loading cached CSV data...")
+    return load_metadata_index(body)
 
-        except requests.RequestException as e:
-            print(f"Error fetching CSV data: {e}")
-            if parent:
-                QMessageBox.warning(parent, "Offline Mode", "Failed to fetch CSV data. Using cached data if available.")
-    else:
-        print("Offline: Cannot fetch CSV data without an internet connection.")
-        if parent:
-            QMessageBox.information(parent, "Offline Mode", "No internet connection detected. Using cached CSV data.")
+def csv_cell(row, column, default=""):
+    """Return a stripped CSV cell, or the default for a missing or empty cell."""
+    value = (row.get(column) or "").strip()
+    return value if value else default
 
-    # Fallback to cached CSV data
-    return load_cached_csv_data()
+def compile_metadata_index(body):
+    """
+    Parse the metadata CSV in a single streaming pass.
+    Args:
+        body (bytes): Raw CSV export.
+    Returns:
+        dict: {"metadata": {folder: info}, "genres": [...], "tags": [...], "genre_tags": {genre: [...]}}
+    Raises:
+        KeyError: If the 'Folder Name' column is missing.
+    """
+    reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+    if "Folder Name" not in (reader.fieldnames or []):
+        raise KeyError("Required column 'Folder Name' not found in the data.")
 
-def load_cached_csv_data():
+    metadata = {}
+    genre_tags = {}
+    for row in reader:
+        folder_name = csv_cell(row, "Folder Name")
+        if not folder_name:
+            continue
+
+        genre = csv_cell(row, "Genre", "Unknown")
+        tags = [tag.strip() for tag in csv_cell(row, "Tags").split(",") if tag.strip()]
+        metadata[folder_name] = {
+            "Genre": genre,
+            "Tags": tags,
+            "Description": csv_cell(row, "Description", "No description available."),
+            "Page Link": csv_cell(row, "Page Link"),
+            "Discord Link": csv_cell(row, "Discord Link"),
+        }
+
+        genre_entry = genre_tags.setdefault(genre, [])
+        genre_entry.extend(tag for tag in tags if tag not in genre_entry)
+
+    return {
+        "metadata": metadata,
+        "genres": sorted(genre_tags),
+        "tags": sorted({tag for tags in genre_tags.values() for tag in tags}),
+        "genre_tags": genre_tags,
+    }
+
+def load_metadata_index(body):
     """
-    Load cached CSV data from the local file.
+    Return the metadata index for a CSV body, reusing the compiled index on disk when the CSV is unchanged.
     Returns:
-        pd.DataFrame or None: Cached CSV data as a DataFrame, or None if not available.
+        dict or None: Compiled metadata index, or None if the CSV cannot be parsed.
     """
+    digest = hashlib.sha1(body).hexdigest()
     try:
-        if os.path.exists(CSV_CACHE_FILE):
-            print("Loading cached CSV data...")
-            return pd.read_csv(CSV_CACHE_FILE)
-        else:
-            print("No cached CSV data found.")
-    except Exception as e:
-        print(f"Failed to load cached CSV data: {e}")
-    return None
+        with open(METADATA_INDEX_FILE, "r") as f:
+            compiled = json.load(f)
+        if compiled.get("source_sha1") == digest:
+            print("Using compiled metadata index.")
+            return compiled["index"]
+    except (OSError, ValueError, KeyError):
+        pass
 
-# Process data to extract genres and tags
-def process_genres_tags(data):
-    if 'Genre' not in data.columns or 'Tags' not in data.columns:
-        raise KeyError("Required columns 'Genre' and 'Tags' not found in the data.")
+    try:
+        index = compile_metadata_index(body)
+    except (KeyError, UnicodeDecodeError, csv.Error) as e:
+        print(f"Failed to parse CSV data: {e}")
+        return None
 
-    genres = data['Genre'].unique()
-    genre_tags = {}
-    for genre in genres:
-        tags = data[data['Genre'] == genre]['Tags'].dropna().astype(str).unique().tolist()
-        genre_tags[genre] = tags
-    return genre_tags
+    try:
+        with open(METADATA_INDEX_FILE, "w") as f:
+            json.dump({"source_sha1": digest, "index": index}, f)
+    except OSError as e:
+        print(f"Failed to save compiled metadata index: {e}")
+    return index
+
+# Genres and their tags, as collected by compile_metadata_index
+def process_genres_tags(index):
+    return index["genre_tags"]
 
 # Populate genres and tags in a QListWidget
 def populate_genres_tags(list_widget, genre_tags):
@@ -299,38 +656,667 @@ def populate_genres_tags(list_widget, genre_tags):
             list_widget.addItem(tag_item)
 
 # Map mods to their metadata (Genre, Tags, and Description)
-def map_mods_to_metadata(data):
-    metadata = {}
-    for _, row in data.iterrows():
-        folder_name = row['Folder Name']  # Folder Name
-        genre = row.get('Genre', "Unknown")  # Genre
-        tags = row.get('Tags', "")  # Tags
-        description = row.get('Description', "No description available.")  # Description
-        page_link = row.get('Page Link', "")  # Page Link
-        discord_link = row.get('Discord Link', "")  # Discord Link
-
-        # Add data to metadata dictionary
-        metadata[folder_name] = {
-            "Genre": genre if pd.notna(genre) else "Unknown",
-            "Tags": [tag.strip() for tag in tags.split(',')] if pd.notna(tags) else [],
-            "Description": description.strip() if pd.notna(description) else "No description available.",
-            "Page Link": page_link.strip() if pd.notna(page_link) else "",
-            "Discord Link": discord_link.strip() if pd.notna(discord_link) else ""
+def map_mods_to_metadata(index):
+    return index["metadata"]
+
+def sync_combo_items(combo, items):
+    """
+    Make a QComboBox list `items`, removing and inserting only the entries that differ.
+    The current selection is kept while it is still listed. Signals are blocked throughout.
+    Returns:
+        bool: True if the entries changed.
+    """
+    items = list(items)
+    if [combo.itemText(i) for i in range(combo.count())] == items:
+        return False
+
+    selected = combo.currentText()
+    was_blocked = combo.blockSignals(True)
+
+    wanted = set(items)
+    for i in reversed(range(combo.count())):
+        if combo.itemText(i) not in wanted:
+            combo.removeItem(i)
+
+    for i, text in enumerate(items):
+        if i < combo.count() and combo.itemText(i) == text:
+            continue
+        existing = combo.findText(text, Qt.MatchFlag.MatchExactly)
+        if existing > i:
+            combo.removeItem(existing)  # Entry moved; re-insert it at its new position
+        combo.insertItem(i, text)
+
+    while combo.count() > len(items):
+        combo.removeItem(combo.count() - 1)
+
+    index = combo.findText(selected, Qt.MatchFlag.MatchExactly)
+    if index >= 0:
+        combo.setCurrentIndex(index)
+    combo.blockSignals(was_blocked)
+    return True
 
+############################################################
+# Startup bootstrap (remote data)
+############################################################
+
+def bootstrap_remote_data():
+    """
+    Fetch every remote resource needed at startup exactly once, concurrently.
+    Each fetch falls back to its own cache, so one slow endpoint never blocks the others.
+    Returns:
+        dict: {"modpack_data": dict, "metadata_index": dict or None, "logo_available": bool}
+    """
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        executor.submit(profiler.profiled()(set_git_buffer_size))
+        modpack_future = executor.submit(profiler.profiled()(fetch_modpack_data), url)
+        csv_future = executor.submit(profiler.profiled()(fetch_csv_data), sheet_url)
+        logo_future = executor.submit(profiler.profiled()(download_logo), LOGO_URL, LOGO_PATH)
+
+        return {
+            "modpack_data": modpack_future.result(),
+            "metadata_index": csv_future.result(),
+            "logo_available": logo_future.result(),
         }
-    return metadata
+
+class BootstrapWorker(QThread):
+    finished = pyqtSignal(dict)  # Signal carrying the fetched startup data
+
+    def run(self):
+        try:
+            with profiler.span("bootstrap_remote_data"):
+                result = bootstrap_remote_data()
+            self.finished.emit(result)
+        except Exception as e:
+            print(f"Startup bootstrap failed: {e}")
+            self.finished.emit({})
+
+############################################################
+# Git transfer progress
+############################################################
+
+GIT_PROGRESS_PATTERN = re.compile(
+    r"(?:remote: )?(?P<phase>[A-Za-z ]+?):\s+(?P<percent>\d+)% \((?P<current>\d+)/(?P<total>\d+)\)"
+    r"(?:, (?P<size>[\d.]+) (?P<size_unit>bytes|[KMG]iB))?(?: \| (?P<rate>[\d.]+) (?P<rate_unit>bytes|[KMG]iB)/s)?"
+)
+BYTE_UNITS = {"bytes": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3}
+
+def format_bytes(size):
+    """Format a byte count the way git does (KiB, MiB, ...)."""
+    for unit in ("bytes", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "bytes" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GiB"
+
+class GitProgressParser:
+    """Incrementally parse `git --progress` output into progress events."""
+
+    def __init__(self):
+        self.buffer = ""
+        self.received_bytes = 0
+        self.rate = 0.0
+        self.phase_started = {}
+        self.submodule = ""
+
+    def feed(self, text):
+        """
+        Parse a chunk of output. Progress lines are terminated by \r, other lines by \n.
+        Returns:
+            list: {"phase", "percent", "current", "total", "bytes", "rate", "eta", "submodule"} dicts.
+        """
+        self.buffer += text
+        *lines, self.buffer = re.split(r"[\r\n]", self.buffer)
+        events = []
+        for line in lines:
+            event = self.parse_line(line.strip())
+            if event:
+                events.append(event)
+        return events
+
+    def parse_line(self, line):
+        cloning = re.match(r"Cloning into '(.+)'", line)
+        if cloning:
+            self.submodule = os.path.basename(cloning.group(1).rstrip("/\\"))
+            return None
+
+        match = GIT_PROGRESS_PATTERN.search(line)
+        if not match:
+            return None
+
+        phase = match["phase"].strip()
+        percent = int(match["percent"])
+        now = time.perf_counter()
+        elapsed = now - self.phase_started.setdefault(phase, now)
+        if match["size"]:
+            self.received_bytes = int(float(match["size"]) * BYTE_UNITS[match["size_unit"]])
+        if match["rate"]:
+            self.rate = float(match["rate"]) * BYTE_UNITS[match["rate_unit"]]
+
+        return {
+            "phase": phase,
+            "percent": percent,
+            "current": int(match["current"]),
+            "total": int(match["total"]),
+            "bytes": self.received_bytes,
+            "rate": self.rate,
+            "eta": elapsed / percent * (100 - percent) if 0 < percent < 100 else 0.0,
+            "submodule": self.submodule,
+        }
+
+def format_progress_event(event):
+    """One-line form of a GitProgressParser event, e.g. 'Receiving objects 45% · 1.2 MiB · 300.0 KiB/s · ETA 12 s'."""
+    parts = [f"{event['phase']} {event['percent']}%"]
+    if event["bytes"]:
+        parts.append(format_bytes(event["bytes"]))
+    if event["rate"]:
+        parts.append(f"{format_bytes(event['rate'])}/s")
+    if event["eta"]:
+        parts.append(f"ETA {event['eta']:.0f} s")
+    return " · ".join(parts)
+
+transfer_log_lock = threading.Lock()
+
+def log_transfer(operation, target, seconds, size, success, **details):
+    """Append one finished git transfer to TRANSFER_LOG_FILE, to spot slow mirrors and submodules."""
+    entry = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "operation": operation,
+        "target": target,
+        "seconds": round(seconds, 3),
+        "bytes": size,
+        "bytes_per_second": round(size / seconds) if seconds > 0 else 0,
+        "success": success,
+    }
+    entry.update(details)
+    with transfer_log_lock:
+        try:
+            if os.path.exists(TRANSFER_LOG_FILE) and os.path.getsize(TRANSFER_LOG_FILE) > TRANSFER_LOG_MAX_SIZE:
+                os.replace(TRANSFER_LOG_FILE, TRANSFER_LOG_FILE + ".1")
+            with open(TRANSFER_LOG_FILE, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Failed to write transfer log: {e}")
+
+def stream_git(args, cwd, on_output, on_start=None):
+    """
+    Run a git command, passing its merged stdout/stderr to `on_output` as it arrives.
+    `on_start` receives the Popen object, e.g. so the process can be terminated on cancel.
+    Returns:
+        tuple: (returncode, output)
+    """
+    creationflags = subprocess.CREATE_NO_WINDOW if system_platform == "Windows" else 0
+    process = subprocess.Popen(["git"] + args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, creationflags=creationflags)
+    if on_start:
+        on_start(process)
+    chunks = []
+    while True:
+        data = process.stdout.read1(4096)
+        if not data:
+            break
+        text = data.decode("utf-8", errors="replace")
+        chunks.append(text)
+        on_output(text)
+    return process.wait(), "".join(chunks)
+
+def submodule_transfer_event(event, started):
+    """
+    Turn a SubmoduleFetcher event into a transfer progress event for the progress dialog.
+    Returns:
+        dict: {"percent": overall 0-100, "text": str, "event": the original event}
+    """
+    completed, total = event["completed"], event["total"]
+    text = f"{completed}/{total} mods"
+    if completed:
+        remaining = (time.perf_counter() - started) / completed * (total - completed)
+        text += f" · ETA {remaining:.0f} s"
+    if event.get("progress"):
+        text += f"\n{event['path']}: {format_progress_event(event['progress'])}"
+    return {"percent": int(completed / total * 100) if total else 0, "text": text, "event": event}
+
+############################################################
+# Parallel submodule fetching
+############################################################
+
+def list_submodules(repo):
+    """
+    Return the submodules declared in .gitmodules.
+    Returns:
+        list: (name, path) tuples in declaration order.
+    """
+    output = repo.git.config('-f', '.gitmodules', '--get-regexp', r'^submodule\..*\.path$', with_exceptions=False)
+    submodules = []
+    for line in output.splitlines():
+        key, _, path = line.partition(" ")
+        submodules.append((key[len("submodule."):-len(".path")], path))
+    return submodules
+
+def directory_size(path):
+    """Total size in bytes of the files below a directory."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+object_store_lock = threading.Lock()  # Serializes writes to SHARED_OBJECTS_FOLDER
+
+def ensure_object_store():
+    """
+    Create the shared object store if needed.
+    Returns:
+        str or None: Path of the store, or None if it cannot be created.
+    """
+    with object_store_lock:
+        if not os.path.isdir(SHARED_OBJECTS_FOLDER):
+            try:
+                store = Repo.init(SHARED_OBJECTS_FOLDER, bare=True, mkdir=True)
+            except (GitCommandError, OSError) as e:
+                print(f"Failed to create shared object store: {e}")
+                return None
+            # Clones depend on these objects, so the store must never drop any of them
+            with store.config_writer() as config:
+                config.set_value("gc", "auto", "0")
+                config.set_value("gc", "pruneExpire", "never")
+            print(f"Created shared object store at: {SHARED_OBJECTS_FOLDER}")
+    return SHARED_OBJECTS_FOLDER
+
+def object_store_key(url):
+    """Ref namespace in the shared store for a remote URL."""
+    url = url.strip().rstrip("/")
+    if url.endswith(".git"):
+        url = url[:-len(".git")]
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", url.split("://", 1)[-1]).strip("._") or "unnamed"
+
+def seed_object_store(url, git_dir):
+    """
+    Copy the objects of a fresh full clone into the shared store (a local fetch, no network).
+    Refs are kept under refs/mods/<key>/ so the objects stay reachable.
+    """
+    store = ensure_object_store()
+    if not store:
+        return
+    key = object_store_key(url)
+    with object_store_lock:
+        try:
+            Repo(store).git.fetch('--no-tags', '--quiet', git_dir, f'+refs/heads/*:refs/mods/{key}/heads/*', f'+HEAD:refs/mods/{key}/HEAD')
+        except GitCommandError as e:
+            print(f"Failed to add {url} to the shared object store: {e}")
+
+def modpack_base_repo(url):
+    """Path of the bare base repository shared by every branch of a modpack URL."""
+    return os.path.join(MODPACK_REPOS_FOLDER, object_store_key(url) + ".git")
+
+def incomplete_download_marker(repo_path):
+    """Marker file that exists while a modpack download has not finished all its submodules."""
+    return os.path.join(os.path.dirname(repo_path), f".{os.path.basename(repo_path)}.incomplete")
+
+def is_download_incomplete(repo_path):
+    """Check whether a modpack folder is an interrupted download that can be resumed."""
+    return os.path.isdir(repo_path) and os.path.exists(incomplete_download_marker(repo_path))
+
+class SubmoduleFetcher:
+    """
+    Fetch the submodules of a repository with a bounded pool of `git submodule update` processes.
+    Each submodule reports its state through `on_event` as a dict:
+    {"name", "path", "state": queued|fetching|done|failed, "bytes", "seconds", "error", "completed", "total"}
+    While fetching, "progress" holds the latest GitProgressParser event (at most every 0.25 s).
+    With `object_store`, new submodule clones borrow objects from the shared store and add theirs to it.
+    """
+
+    def __init__(self, repo, jobs=DEFAULT_SUBMODULE_JOBS, extra_args=(), on_event=None, object_store=None):
+        self.repo = repo
+        self.jobs = max(1, int(jobs))
+        self.extra_args = list(extra_args)
+        self.on_event = on_event
+        self.object_store = object_store
+        self.lock = threading.Lock()
+        self.completed = 0
+        self.total = 0
+        self.cancelled = False
+        self.processes = set()  # Running git processes, terminated on cancel
+
+    def cancel(self):
+        """Stop queued submodules from starting and terminate the running ones."""
+        self.cancelled = True
+        with self.lock:
+            processes = list(self.processes)
+        for process in processes:
+            process.terminate()
+
+    def track_process(self, process):
+        with self.lock:
+            self.processes.add(process)
+        if self.cancelled:
+            process.terminate()
+
+    def emit(self, name, path, state, **details):
+        event = {"name": name, "path": path, "state": state, "bytes": 0, "seconds": 0.0, "error": "", "progress": None}
+        event.update(details)
+        with self.lock:
+            if state in ("done", "failed"):
+                self.completed += 1
+            event["completed"] = self.completed
+            event["total"] = self.total
+        if self.on_event:
+            self.on_event(event)
+
+    def fetch_one(self, name, path):
+        if self.cancelled:
+            self.emit(name, path, "failed", error="Cancelled")
+            return False
+        module_dir = os.path.join(self.repo.git_dir, "modules", name)
+        size_before = directory_size(module_dir)
+        self.emit(name, path, "fetching")
+        start = time.perf_counter()
+        reference_args = ['--reference', self.object_store] if self.object_store else []
+        parser = GitProgressParser()
+        last_emit = 0.0
+
+        def on_output(text):
+            nonlocal last_emit
+            for progress in parser.feed(text):
+                now = time.perf_counter()
+                if now - last_emit >= 0.25 or progress["percent"] == 100:
+                    last_emit = now
+                    self.emit(name, path, "fetching", progress=progress)
+
+        args = ['submodule', 'update', '--progress', '--init', '--recursive', *reference_args, *self.extra_args, '--', path]
+        process = None
+
+        def on_start(started_process):
+            nonlocal process
+            process = started_process
+            self.track_process(process)
+
+        returncode, output = stream_git(args, self.repo.working_tree_dir, on_output, on_start)
+        with self.lock:
+            self.processes.discard(process)
+        seconds = time.perf_counter() - start
+        submodule_url = self.repo.git.config('--get', f'submodule.{name}.url', with_exceptions=False)
+        if returncode != 0:
+            if self.cancelled:
+                error = "Cancelled"
+            else:
+                error = output.strip().splitlines()[-1] if output.strip() else f"git exited with code {returncode}"
+            log_transfer("submodule", path, seconds, parser.received_bytes, False, url=submodule_url, error=error)
+            self.emit(name, path, "failed", seconds=seconds, error=error)
+            return False
+
+        size = max(0, directory_size(module_dir) - size_before)
+        log_transfer("submodule", path, seconds, parser.received_bytes or size, True, url=submodule_url)
+        if self.object_store and size:
+            seed_object_store(submodule_url or name, module_dir)
+        self.emit(name, path, "done", bytes=size, seconds=seconds)
+        return True
+
+    def run(self, submodules=None):
+        """
+        Fetch the given (name, path) submodules, or all of them.
+        Returns:
+            list: Paths of the submodules that failed.
+        """
+        if submodules is None:
+            submodules = list_submodules(self.repo)
+        self.total = len(submodules)
+        self.completed = 0
+        if not submodules:
+            return []
+
+        # Register every submodule first, so the parallel updates never contend for the superproject config
+        self.repo.git.submodule('init')
+        for name, path in submodules:
+            self.emit(name, path, "queued")
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            results = list(executor.map(lambda submodule: self.fetch_one(*submodule), submodules))
+        return [path for (_, path), ok in zip(submodules, results) if not ok]
+
+def format_submodule_event(event):
+    """Human readable one-line form of a SubmoduleFetcher event."""
+    text = f"[{event['completed']}/{event['total']}] {event['path']}: {event['state']}"
+    if event["state"] == "done":
+        text += f" ({event['bytes'] / 1024 / 1024:.1f} MB in {event['seconds']:.1f} s)"
+    elif event["state"] == "failed":
+        text += f" after {event['seconds']:.1f} s: {event['error']}"
+    return text
+
+def format_submodule_states(states, limit=3):
+    """
+    Summarize the latest SubmoduleFetcher event of each submodule for the progress dialog.
+    Returns:
+        str: Which mods are being fetched and which failed, or "" when there is nothing to show.
+    """
+    lines = []
+    for state, label in (("fetching", "Fetching"), ("failed", "Failed")):
+        paths = [path for path, event in states.items() if event["state"] == state]
+        if paths:
+            more = f" and {len(paths) - limit} more" if len(paths) > limit else ""
+            lines.append(f"{label}: {', '.join(os.path.basename(path) for path in paths[:limit])}{more}")
+    return "\n".join(lines)
+
+############################################################
+# Archive mod downloads
+############################################################
+
+def github_archive_url(url, sha):
+    """Return the tarball URL of a GitHub repository at a commit, or None if the URL is not on GitHub."""
+    match = GITHUB_REPO_PATTERN.match(url.strip())
+    if not match:
+        return None
+    return ARCHIVE_URL_TEMPLATE.format(owner=match.group("owner"), repo=match.group("repo"), sha=sha)
+
+def archive_manifest_path(repo):
+    return os.path.join(repo.git_dir, ARCHIVE_MANIFEST_NAME)
+
+def load_archive_manifest(repo):
+    """Return {path: sha} of the mods extracted from archives in a checkout."""
+    try:
+        with open(archive_manifest_path(repo), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_archive_manifest(repo, manifest):
+    path = archive_manifest_path(repo)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def extract_tar_stream(fileobj, destination, should_cancel=None):
+    """
+    Extract a .tar.gz stream into destination while it downloads, dropping the archive's top-level folder.
+    Only directories and regular files are written; links and entries escaping the destination are skipped.
+    Returns:
+        int: Bytes of file content written.
+    Raises:
+        tarfile.TarError: If the stream is not a valid archive.
+        InterruptedError: If should_cancel() returns True.
+    """
+    written = 0
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as archive:
+        for member in archive:
+            if should_cancel and should_cancel():
+                raise InterruptedError("Cancelled")
+            parts = [part for part in member.name.replace("\\", "/").split("/")[1:] if part not in ("", ".")]
+            if not parts or ".." in parts or os.path.isabs(parts[0]):
+                continue
+            target = os.path.join(destination, *parts)
+            if member.isdir():
+                os.makedirs(target, exist_ok=True)
+            elif member.isfile():
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with archive.extractfile(member) as source, open(target, "wb") as f:
+                    shutil.copyfileobj(source, f, 1024 * 1024)
+                written += member.size
+    return written
+
+class ArchiveModFetcher(SubmoduleFetcher):
+    """
+    Fetch mods as archives of the commits their gitlinks pin, with no git history.
+    Takes {path: {"name", "url", "sha"}} entries from read_submodule_table and reports the same
+    events as SubmoduleFetcher. Each mod is extracted next to its folder and swapped in when complete,
+    and the checkout's archive manifest records which commit every folder holds.
+    Mods that have no archive URL are left to `git_fetcher`, a SubmoduleFetcher (see sync_archive_mods).
+    """
+
+    def __init__(self, repo, jobs=DEFAULT_SUBMODULE_JOBS, on_event=None, git_fetcher=None, url_builder=github_archive_url):
+        super().__init__(repo, jobs, on_event=on_event)
+        self.git_fetcher = git_fetcher
+        self.url_builder = url_builder
+        self.manifest = load_archive_manifest(repo)
+        self.entries = {}
+        self.responses = set()  # Open HTTP streams, closed on cancel
+
+    def cancel(self):
+        super().cancel()
+        if self.git_fetcher:
+            self.git_fetcher.cancel()
+        with self.lock:
+            responses = list(self.responses)
+        for response in responses:
+            response.close()
+
+    def is_current(self, path, entry):
+        """Whether the mod folder already holds the pinned commit."""
+        return self.manifest.get(path) == entry["sha"] and os.path.isdir(os.path.join(self.repo.working_tree_dir, path))
+
+    def fetch_one(self, name, path):
+        if self.cancelled:
+            self.emit(name, path, "failed", error="Cancelled")
+            return False
+        entry = self.entries[path]
+        url = self.url_builder(entry["url"], entry["sha"])
+        destination = os.path.join(self.repo.working_tree_dir, path)
+        staging = destination + ".archive-part"
+        self.emit(name, path, "fetching")
+        start = time.perf_counter()
+        size = 0
+        try:
+            shutil.rmtree(staging, ignore_errors=True)
+            response = http_get(url, stream=True)
+            with self.lock:
+                self.responses.add(response)
+            try:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                size = extract_tar_stream(response.raw, staging, lambda: self.cancelled)
+            finally:
+                with self.lock:
+                    self.responses.discard(response)
+                response.close()
+            if os.path.exists(destination):
+                shutil.rmtree(destination, onerror=readonly_handler)
+            os.replace(staging, destination)
+        except (requests.RequestException, tarfile.TarError, OSError, EOFError) as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            seconds = time.perf_counter() - start
+            error = "Cancelled" if self.cancelled else str(e)
+            log_transfer("archive", path, seconds, size, False, url=url, error=error)
+            self.emit(name, path, "failed", seconds=seconds, error=error)
+            return False
+
+        seconds = time.perf_counter() - start
+        with self.lock:
+            self.manifest[path] = entry["sha"]
+        log_transfer("archive", path, seconds, size, True, url=url)
+        self.emit(name, path, "done", bytes=size, seconds=seconds)
+        return True
+
+    def run(self, entries):
+        """
+        Download and extract the given {path: entry} mods in parallel.
+        Returns:
+            list: Paths of the mods that failed.
+        """
+        self.entries = dict(entries)
+        self.total = len(self.entries)
+        self.completed = 0
+        if not self.entries:
+            return []
+        for path, entry in self.entries.items():
+            self.emit(entry["name"], path, "queued")
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                results = list(executor.map(lambda item: self.fetch_one(item[1]["name"], item[0]), self.entries.items()))
+        finally:
+            # Record what finished even when cancelled, so a resumed download skips it
+            save_archive_manifest(self.repo, self.manifest)
+        return [path for path, ok in zip(self.entries, results) if not ok]
+
+def sync_archive_mods(repo, fetcher):
+    """
+    Bring an archive-mode checkout's mods to the commits pinned at HEAD.
+    Mods no longer in the pack are deleted, mods not yet at their pinned commit are downloaded
+    as archives by the ArchiveModFetcher, and mods that are not hosted on GitHub go through its git_fetcher.
+    Returns:
+        dict: Same shape as the reconcile_submodules report.
+    """
+    table = read_submodule_table(repo, "HEAD")
+    report = {"added": [], "removed": [], "updated": [], "failed": [], "unchanged": 0}
+
+    for path in list(fetcher.manifest):
+        if path not in table:
+            print(f"Removing stale mod: {path}")
+            target = os.path.join(repo.working_tree_dir, path)
+            if os.path.exists(target):
+                shutil.rmtree(target, onerror=readonly_handler)
+            del fetcher.manifest[path]
+            report["removed"].append(path)
+
+    archives, via_git = {}, []
+    for path, entry in table.items():
+        if fetcher.is_current(path, entry) or submodule_head(repo, path) == entry["sha"]:
+            report["unchanged"] += 1
+            continue
+        report["updated" if path in fetcher.manifest else "added"].append(path)
+        if fetcher.url_builder(entry["url"], entry["sha"]):
+            archives[path] = entry
+        else:
+            via_git.append((entry["name"], path))
+
+    report["failed"] = fetcher.run(archives)
+    if not archives:
+        save_archive_manifest(repo, fetcher.manifest)  # Marks the checkout as archive mode, and records removals
+    if via_git and fetcher.git_fetcher and not fetcher.cancelled:
+        print(f"{len(via_git)} mod(s) are not on GitHub, fetching them with git")
+        report["failed"] += fetcher.git_fetcher.run(via_git)
+    elif via_git:
+        report["failed"] += [path for _, path in via_git]
+    return report
 
 class ModpackDownloadWorker(QThread):
     finished = pyqtSignal(bool, str)
     progress = pyqtSignal(int)  # Signal to update progress (optional)
+    submodule_progress = pyqtSignal(dict)  # Per-submodule SubmoduleFetcher events
+    transfer_progress = pyqtSignal(dict)  # {"percent", "text"} for the progress dialog
 
-    def __init__(self, clone_url, repo_name, branch_name, force_update=False):
+    def __init__(self, clone_url, repo_name, branch_name, force_update=False, clone_strategy=DEFAULT_CLONE_STRATEGY,
+                 submodule_jobs=DEFAULT_SUBMODULE_JOBS, resume=False, repair=False, deduplicate=True):
         super().__init__()
         self.clone_url = clone_url
         self.repo_name = os.path.join(os.getcwd(), "Modpacks", repo_name)
         self.branch_name = branch_name
         self.force_update = force_update
-        self.process = None  # Store the QProcess instance
+        self.clone_strategy = clone_strategy if clone_strategy in CLONE_STRATEGIES else DEFAULT_CLONE_STRATEGY
+        self.submodule_jobs = submodule_jobs
+        self.resume = resume  # Keep an interrupted download and fetch only what is missing
+        self.repair = repair  # Fetch and reset an existing checkout instead of recloning it
+        self.deduplicate = deduplicate  # Share identical mod files with other modpacks through the store
+        self.process = None  # Running git process (subprocess.Popen), terminated on cancel
+        self.fetcher = None  # SubmoduleFetcher while submodules are being fetched
+        self.cancelled = False
+
+    def cancel(self):
+        """Request cancellation; the running git process is terminated, an HTTP stream stops at its next chunk."""
+        self.cancelled = True
+        process = self.process
+        if process:
+            process.terminate()
+        if self.fetcher:
+            self.fetcher.cancel()
 
     def run(self):
         try:
@@ -338,12 +1324,17 @@ class ModpackDownloadWorker(QThread):
             os.makedirs(os.path.dirname(self.repo_name), exist_ok=True)
 
             # Check if the repository folder already exists
-            if os.path.exists(self.repo_name):
+            if self.resume and is_download_incomplete(self.repo_name) and os.path.isdir(modpack_base_repo(self.clone_url)):
+                print(f"Resuming download of {self.repo_name}")
+            elif os.path.exists(self.repo_name):
+                if self.repair and self.clone_url.endswith('.git') and self.repair_checkout():
+                    return
                 if self.force_update:
-                    # Delete the existing folder if force_update is True
+                    # Move the existing folder aside if force_update is True; it is deleted in the background,
+                    # and its worktree entry is pruned on checkout
                     try:
-                        shutil.rmtree(self.repo_name, onerror=readonly_handler)
-                        print(f"Deleted existing folder: {self.repo_name}")
+                        tombstone = tombstone_folder(self.repo_name)
+                        print(f"Moved existing folder aside for deletion: {tombstone}")
                     except Exception as e:
                         self.finished.emit(False, f"Failed to delete existing folder: {str(e)}")
                         return
@@ -353,29 +1344,36 @@ class ModpackDownloadWorker(QThread):
                     return
 
             if self.clone_url.endswith('.git'):
-                # Clone the repository using the selected branch
-                git_command = ["git", "clone", "--branch", self.branch_name, "--recurse-submodules", "--remote-submodules", self.clone_url, self.repo_name]
-                self.process = QProcess()
-                self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
-                
-                # Connect QProcess signals for dynamic output handling
-                self.process.finished.connect(self.git_finished)
-                self.process.readyReadStandardOutput.connect(self.read_git_output)
-                self.process.start(git_command[0], git_command[1:])
-                self.process.waitForFinished(-1)
+                self.checkout_worktree()
             else:
                 # Download the file (this part will still emit the success message)
-                response = requests.get(self.clone_url, stream=True)
-                if response.status_code != 200:
+                local_file_path = os.path.join(os.getcwd(), self.repo_name + '.zip')
+                partial_file_path = local_file_path + '.part'  # Kept on cancel or failure, resumed with a Range request
+
+                downloaded_size = os.path.getsize(partial_file_path) if os.path.exists(partial_file_path) else 0
+                headers = {"Range": f"bytes={downloaded_size}-"} if downloaded_size else {}
+                response = http_get(self.clone_url, stream=True, headers=headers)
+                if response.status_code == 416:
+                    # Range not satisfiable: the partial file is stale, start over
+                    os.remove(partial_file_path)
+                    downloaded_size = 0
+                    response = http_get(self.clone_url, stream=True)
+                if response.status_code not in (200, 206):
                     self.finished.emit(False, f"File download failed: HTTP status {response.status_code}.")
                     return
 
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded_size = 0
-                local_file_path = os.path.join(os.getcwd(), self.repo_name + '.zip')
-
-                with open(local_file_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=1024):
+                if response.status_code == 206:
+                    print(f"Resuming download at {downloaded_size} bytes")
+                else:
+                    downloaded_size = 0  # Server ignored the Range header
+                total_size = downloaded_size + int(response.headers.get('content-length', 0))
+
+                with open(partial_file_path, 'ab' if downloaded_size else 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        if self.cancelled:
+                            response.close()
+                            self.finished.emit(False, "Download cancelled. Run Download again to resume.")
+                            return
                         if chunk:
                             f.write(chunk)
                             downloaded_size += len(chunk)
@@ -383,165 +1381,1927 @@ class ModpackDownloadWorker(QThread):
                             if total_size > 0:
                                 progress_percent = int((downloaded_size / total_size) * 100)
                                 self.progress.emit(progress_percent)
+                                self.transfer_progress.emit({"percent": progress_percent,
+                                                             "text": f"{format_bytes(downloaded_size)} of {format_bytes(total_size)}"})
+
+                # Verify the file size after download
+                if downloaded_size != total_size:
+                    self.finished.emit(False, "File download failed: Incomplete file. Run Download again to resume.")
+                    return
+                os.replace(partial_file_path, local_file_path)
+
+                # Unzip if necessary
+                if zipfile.is_zipfile(local_file_path):
+                    try:
+                        with zipfile.ZipFile(local_file_path, 'r') as zip_ref:
+                            zip_ref.extractall(self.repo_name)
+                        os.remove(local_file_path)
+                    except zipfile.BadZipFile:
+                        self.finished.emit(False, "File download failed: Corrupt ZIP file.")
+                        return
+
+                # If file download succeeds, emit success
+                self.share_mod_files()
+                self.finished.emit(True, f"Successfully downloaded {self.repo_name}.")
+
+        except Exception as e:
+            self.finished.emit(False, f"An unexpected error occurred: {str(e)}")
+
+    def run_git(self, args, operation=None):
+        """
+        Run a git command with stream_git, printing its output as it arrives.
+        With `operation`, progress is parsed into transfer_progress events and the transfer is logged.
+        Returns:
+            tuple: (success, output)
+        """
+        progress = GitProgressParser() if operation else None
+
+        def on_output(text):
+            print(text)
+            if progress:
+                for event in progress.feed(text):
+                    self.transfer_progress.emit({"percent": event["percent"], "text": format_progress_event(event)})
+
+        def on_start(process):
+            self.process = process
+            if self.cancelled:
+                process.terminate()  # Cancelled before the process existed
+
+        start = time.perf_counter()
+        try:
+            returncode, output = stream_git(args, None, on_output, on_start)
+        except OSError as e:
+            returncode, output = None, f"Could not run git: {e}"
+        finally:
+            self.process = None
+
+        success = returncode == 0
+        if operation:
+            log_transfer(operation, os.path.basename(self.repo_name), time.perf_counter() - start,
+                         progress.received_bytes, success, url=self.clone_url)
+        return success, output.strip()
+
+    def checkout_worktree(self):
+        """
+        Check out the branch as a worktree of the modpack's bare base repository.
+        The base is cloned on first use; later branches only fetch their new commits.
+        """
+        self.base_repo = modpack_base_repo(self.clone_url)
+        marker = incomplete_download_marker(self.repo_name)
+
+        if self.resume and is_download_incomplete(self.repo_name) and os.path.isdir(self.base_repo):
+            # The checkout exists; only the submodules that never finished are fetched again
+            self.clone_strategy = detect_clone_strategy(Repo(self.repo_name), self.clone_strategy)
+            self.finish_submodules(marker, missing_only=True)
+            return
+
+        if not os.path.isdir(self.base_repo):
+            os.makedirs(MODPACK_REPOS_FOLDER, exist_ok=True)
+            clone_args = ["clone", "--bare", "--progress"] + CLONE_STRATEGIES[self.clone_strategy][1]
+            if self.clone_strategy == "full" and ensure_object_store():
+                clone_args += ["--reference-if-able", SHARED_OBJECTS_FOLDER]
+            success, output = self.run_git(clone_args + [self.clone_url, self.base_repo], "clone")
+            if not success:
+                shutil.rmtree(self.base_repo, ignore_errors=True)
+                if self.cancelled:
+                    self.finished.emit(False, "Download cancelled.")
+                else:
+                    self.finished.emit(False, f"Git clone failed: {output or 'An unknown error occurred.'}")
+                return
+            # A bare clone has no remote-tracking refs; worktrees track origin/<branch>
+            Repo(self.base_repo).git.config('remote.origin.fetch', '+refs/heads/*:refs/remotes/origin/*')
+        else:
+            # Keep the base on the strategy it was created with; archive mode only differs in how mods are fetched
+            detected = detect_clone_strategy(Repo(self.base_repo), self.clone_strategy)
+            if not (self.clone_strategy == "archive" and detected == "shallow"):
+                self.clone_strategy = detected
+
+        fetch_args = ["--git-dir", self.base_repo, "fetch", "--progress"] + submodule_update_args(self.clone_strategy)
+        success, output = self.run_git(fetch_args + ["origin", f"+refs/heads/{self.branch_name}:refs/remotes/origin/{self.branch_name}"], "fetch")
+        if not success:
+            if self.cancelled:
+                self.finished.emit(False, "Download cancelled.")
+            else:
+                self.finished.emit(False, f"Git fetch failed: {output or 'An unknown error occurred.'}")
+            return
+
+        # Forget worktrees whose folders were deleted, then check out the branch
+        self.run_git(["--git-dir", self.base_repo, "worktree", "prune"])
+        success, output = self.run_git(["--git-dir", self.base_repo, "worktree", "add", "--force", "--track",
+                                        "-B", self.branch_name, self.repo_name, f"origin/{self.branch_name}"])
+        if not success or not os.path.isdir(self.repo_name) or not os.listdir(self.repo_name):
+            self.finished.emit(False, f"Git checkout failed: {output or 'An unknown error occurred.'}")
+            return
+
+        # From here on an interruption leaves a resumable download
+        open(marker, "w").close()
+        if self.clone_strategy == "archive":
+            save_archive_manifest(Repo(self.repo_name), {})  # Marks the checkout as archive mode
+        self.finish_submodules(marker)
+
+    def repair_checkout(self):
+        """
+        Bring an existing checkout back to the remote branch, reusing all of its objects:
+        fetch, force checkout, clean, and force-sync every submodule.
+        Returns:
+            bool: False if the repository is corrupt and must be recloned; True once a result was emitted.
+        """
+        try:
+            repo = Repo(self.repo_name)
+            repo.git.rev_parse('--verify', 'HEAD')
+        except (InvalidGitRepositoryError, NoSuchPathError, GitCommandError, ValueError) as e:
+            print(f"Repository at {self.repo_name} is unusable, recloning: {e}")
+            return False
+
+        self.base_repo = repo.common_dir
+        self.clone_strategy = detect_clone_strategy(repo, self.clone_strategy)
+        print(f"Repairing {self.repo_name}")
+
+        fetch_args = ["-C", self.repo_name, "fetch", "--progress"] + submodule_update_args(self.clone_strategy)
+        success, output = self.run_git(fetch_args + ["origin", f"+refs/heads/{self.branch_name}:refs/remotes/origin/{self.branch_name}"], "fetch")
+        if not success:
+            # Keep the folder: a failed fetch is usually the network, which a reclone would not fix
+            self.finished.emit(False, "Download cancelled." if self.cancelled else f"Git fetch failed: {output or 'An unknown error occurred.'}")
+            return True
+
+        success, output = self.run_git(["-C", self.repo_name, "checkout", "--force", "-B", self.branch_name, f"origin/{self.branch_name}"])
+        if not success:
+            print(f"Checkout failed, recloning: {output}")
+            return False  # Missing or broken objects
+
+        for args in (["clean", "-ffd"], ["submodule", "sync", "--recursive"]):
+            success, output = self.run_git(["-C", self.repo_name] + args)
+            if not success:
+                self.finished.emit(False, f"Repair failed at 'git {' '.join(args)}': {output or 'An unknown error occurred.'}")
+                return True
+
+        marker = incomplete_download_marker(self.repo_name)
+        open(marker, "w").close()
+        self.finish_submodules(marker)
+        return True
+
+    def finish_submodules(self, marker, missing_only=False):
+        """Fetch the submodules and report the result; the download stays resumable until all succeed."""
+        failed = self.fetch_submodules(missing_only)
+        if self.cancelled:
+            self.finished.emit(False, "Download cancelled. Run Download again to resume; fetched mods are kept.")
+        elif failed:
+            self.finished.emit(False, f"Cloned {self.repo_name}, but {len(failed)} submodule(s) failed: {', '.join(failed)}\nRun Download again to retry them.")
+        else:
+            os.remove(marker)
+            if self.clone_strategy != "archive":
+                try:
+                    record_remote_heads(Repo(self.repo_name))
+                except (OSError, GitCommandError) as e:
+                    print(f"Could not record the submodule commits of {self.repo_name}: {e}")
+            self.share_mod_files()
+            self.finished.emit(True, f"Successfully cloned {self.repo_name}.")
+
+    def share_mod_files(self):
+        """Deduplicate a finished download against the other modpacks; clones, repairs and zip downloads alike."""
+        if self.deduplicate:
+            self.transfer_progress.emit({"percent": 100, "text": "Sharing identical mod files with other modpacks..."})
+            deduplicate_modpack(self.repo_name, should_cancel=lambda: self.cancelled)  # Never raises
+
+    def fetch_submodules(self, missing_only=False):
+        """Fetch the submodules of the checkout in parallel. Returns the paths that failed."""
+        if self.clone_strategy == "archive":
+            return self.fetch_archives()
+        # Same as `clone --remote-submodules`: check out each submodule's remote branch tip
+        extra_args = ['--remote'] + submodule_update_args(self.clone_strategy)
+        if self.repair:
+            extra_args.append('--force')  # Discard local changes inside the submodules
+        repo = Repo(self.repo_name)
+        object_store = None
+        if self.clone_strategy == "full":
+            # Shallow and partial repositories cannot seed the store without fetching what they skipped
+            object_store = ensure_object_store()
+            if object_store:
+                seed_object_store(self.clone_url, self.base_repo)
+        submodules = None
+        if missing_only:
+            submodules = [(name, path) for name, path in list_submodules(repo) if submodule_head(repo, path) is None]
+            print(f"Resuming: {len(submodules)} submodule(s) left to fetch")
+        self.fetcher = SubmoduleFetcher(repo, self.submodule_jobs, extra_args, self.on_submodule_event, object_store)
+        if self.cancelled:
+            self.fetcher.cancel()
+        self.submodules_started = time.perf_counter()
+        return self.fetcher.run(submodules)
+
+    def fetch_archives(self):
+        """Download every mod not yet at its pinned commit as an archive. Returns the paths that failed."""
+        repo = Repo(self.repo_name)
+        git_fetcher = SubmoduleFetcher(repo, self.submodule_jobs, submodule_update_args("archive"), self.on_submodule_event)
+        self.fetcher = ArchiveModFetcher(repo, self.submodule_jobs, self.on_submodule_event, git_fetcher)
+        if self.cancelled:
+            self.fetcher.cancel()
+        self.submodules_started = time.perf_counter()
+        report = sync_archive_mods(repo, self.fetcher)
+        print(f"Mods: {format_reconcile_report(report)}")
+        return report["failed"]
+
+    def on_submodule_event(self, event):
+        if event["state"] != "fetching" or not event["progress"]:
+            print(format_submodule_event(event))
+        self.submodule_progress.emit(event)
+        self.transfer_progress.emit(submodule_transfer_event(event, self.submodules_started))
+        if event["total"]:
+            self.progress.emit(int(event["completed"] / event["total"] * 100))
+
+def read_submodule_table(repo, rev):
+    """
+    Read the submodules recorded at a revision.
+    Returns:
+        dict: {path: {"name": str, "url": str, "sha": str}} from .gitmodules and the gitlinks in the tree.
+    """
+    gitlinks = {}
+    for line in repo.git.ls_tree('-r', rev).splitlines():
+        meta, _, path = line.partition("\t")
+        mode, _, sha = meta.split(" ")
+        if mode == "160000":
+            gitlinks[path] = sha
+
+    entries = {}
+    output = repo.git.config('--blob', f'{rev}:.gitmodules', '--get-regexp', r'^submodule\..*\.(path|url)$', with_exceptions=False)
+    for line in output.splitlines():
+        key, _, value = line.partition(" ")
+        name, _, field = key[len("submodule."):].rpartition(".")
+        entries.setdefault(name, {})[field] = value
+
+    table = {}
+    for name, entry in entries.items():
+        path = entry.get("path")
+        if path in gitlinks:
+            table[path] = {"name": name, "url": entry.get("url", ""), "sha": gitlinks[path]}
+    return table
+
+def submodule_head(repo, path):
+    """
+    Return the commit checked out in a submodule, or None if it is not checked out.
+    Reads HEAD straight from the submodule's git dir, so checking a whole pack costs no processes.
+    """
+    dot_git = os.path.join(repo.working_tree_dir, path, ".git")
+    try:
+        if os.path.isfile(dot_git):
+            with open(dot_git, "r") as f:
+                git_dir = f.read().strip()[len("gitdir:"):].strip()
+            git_dir = os.path.normpath(os.path.join(os.path.dirname(dot_git), git_dir))
+        elif os.path.isdir(dot_git):
+            git_dir = dot_git
+        else:
+            return None
+        with open(os.path.join(git_dir, "HEAD"), "r") as f:
+            head = f.read().strip()
+    except OSError:
+        return None
+
+    if head.startswith("ref:"):
+        # Attached HEAD (e.g. after `update --remote`); let git resolve the ref
+        try:
+            return Repo(os.path.join(repo.working_tree_dir, path)).head.commit.hexsha
+        except (GitCommandError, ValueError):
+            return None
+    return head
+
+def remove_submodule(repo, name, path):
+    """Remove a submodule that is no longer part of the superproject: its files, git dir and config."""
+    for target in (os.path.join(repo.working_tree_dir, path), os.path.join(repo.git_dir, "modules", name)):
+        if os.path.exists(target):
+            shutil.rmtree(target, onerror=readonly_handler)
+    repo.git.config('--remove-section', f'submodule.{name}', with_exceptions=False)
+
+def reconcile_submodules(repo, old_rev, fetcher, new_rev="HEAD"):
+    """
+    Bring the submodules from `old_rev` to `new_rev` by touching only what changed:
+    new submodules are fetched, stale ones removed, moved URLs re-synced, and changed
+    gitlinks (or checkouts that are missing or on another commit) updated through `fetcher`.
+    Returns:
+        dict: {"added": [...], "removed": [...], "updated": [...], "failed": [...], "unchanged": int}
+    """
+    old = read_submodule_table(repo, old_rev)
+    new = read_submodule_table(repo, new_rev)
+    report = {"added": [], "removed": [], "updated": [], "failed": [], "unchanged": 0}
+
+    for path, entry in old.items():
+        if path not in new or new[path]["name"] != entry["name"]:
+            print(f"Removing stale submodule: {path}")
+            remove_submodule(repo, entry["name"], path)
+            report["removed"].append(path)
+
+    to_fetch = []
+    for path, entry in new.items():
+        checked_out = submodule_head(repo, path) == entry["sha"]
+        previous = old.get(path)
+        if previous is None or previous["name"] != entry["name"]:
+            report["added"].append(path)
+        elif previous["url"] != entry["url"]:
+            repo.git.submodule('sync', '--', path)
+            report["updated"].append(path)
+        elif previous["sha"] != entry["sha"] or not checked_out:
+            report["updated"].append(path)
+        else:
+            report["unchanged"] += 1
+            continue
+        to_fetch.append((entry["name"], path))
+
+    if to_fetch:
+        report["failed"] = fetcher.run(to_fetch)
+    return report
+
+def record_remote_heads(repo):
+    """
+    Remember the commit each submodule was checked out at by a download, which follows the
+    submodules' remote branches rather than the gitlinks, so probe_for_updates accepts them.
+    """
+    heads = {}
+    for path in read_submodule_table(repo, "HEAD"):
+        head = submodule_head(repo, path)
+        if head:
+            heads[path] = head
+    path = os.path.join(repo.git_dir, REMOTE_HEADS_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(heads, f, indent=4, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def load_remote_heads(repo):
+    """Return {path: sha} recorded by record_remote_heads."""
+    try:
+        with open(os.path.join(repo.git_dir, REMOTE_HEADS_NAME), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def probe_for_updates(repo, branch_name):
+    """
+    Cheap check whether an update would change anything, without a status walk or a pull.
+    Compares local HEAD with `git ls-remote` for the branch, and each submodule checkout with its gitlink,
+    or with the remote tip a download checked it out at (see record_remote_heads).
+    Returns:
+        tuple: (up_to_date, reason). up_to_date is None when the remote cannot be reached.
+    """
+    archives = load_archive_manifest(repo)
+    remote_heads = load_remote_heads(repo)
+    stale = []
+    for path, entry in read_submodule_table(repo, "HEAD").items():
+        if archives.get(path) == entry["sha"]:
+            continue
+        head = submodule_head(repo, path)
+        if head is None or head not in (entry["sha"], remote_heads.get(path)):
+            stale.append(path)
+    if stale:
+        return False, f"{len(stale)} submodule(s) not at their recorded commit"
+
+    try:
+        output = repo.git.ls_remote('origin', f'refs/heads/{branch_name}')
+    except GitCommandError as e:
+        return None, f"Could not reach the remote: {e}"
+    if not output:
+        return None, f"Branch '{branch_name}' not found on the remote"
+
+    remote_head = output.split()[0]
+    if remote_head != repo.head.commit.hexsha:
+        return False, f"New commits on {branch_name}"
+    return True, "Already up to date."
+
+def format_reconcile_report(report):
+    """One-line summary of a reconcile_submodules report."""
+    return (f"{len(report['added'])} added, {len(report['updated'])} updated, {len(report['removed'])} removed, "
+            f"{report['unchanged']} unchanged" + (f", {len(report['failed'])} failed" if report["failed"] else ""))
+
+class ModpackUpdateWorker(QThread):
+    finished = pyqtSignal(bool, str)  # Signal to indicate task completion with success status and message
+    progress = pyqtSignal(str)       # Signal to report progress to the GUI
+    submodule_progress = pyqtSignal(dict)  # Per-submodule SubmoduleFetcher events
+    transfer_progress = pyqtSignal(dict)  # {"percent", "text"} for the progress dialog
+
+    def __init__(self, repo_url, repo_name, branch_name, parent_folder, clone_strategy=DEFAULT_CLONE_STRATEGY,
+                 submodule_jobs=DEFAULT_SUBMODULE_JOBS, deduplicate=True):
+        super().__init__()
+        self.repo_url = repo_url
+        self.repo_name = repo_name
+        self.branch_name = branch_name
+        self.repo_path = os.path.join(parent_folder, self.repo_name)
+        self.clone_strategy = clone_strategy
+        self.submodule_jobs = submodule_jobs
+        self.deduplicate = deduplicate  # Share identical mod files with other modpacks through the store
+
+    def run(self):
+        try:
+            if not os.path.exists(self.repo_path) or not os.path.isdir(self.repo_path):
+                self.finished.emit(False, f"Invalid repository path: {self.repo_path}")
+                return
+
+            repo = Repo(self.repo_path)
+
+            # Skip all work when neither the pack nor its submodules would change
+            self.progress.emit("Checking for updates...")
+            start = time.perf_counter()
+            up_to_date, reason = probe_for_updates(repo, self.branch_name)
+            print(f"Update probe: {reason} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+            if up_to_date:
+                self.finished.emit(True, f"{self.repo_name} is already up to date.")
+                return
+
+            # Keep the repository on the strategy it was cloned with
+            self.clone_strategy = detect_clone_strategy(repo, self.clone_strategy)
+
+            # Handle uncommitted changes
+            try:
+                if repo.is_dirty(untracked_files=True):
+                    self.progress.emit("Uncommitted changes detected. Resetting and cleaning repository...")
+                    repo.git.reset('--hard')  # Discard local changes
+                    repo.git.clean('-fd')     # Remove untracked files and directories
+            except GitCommandError as e:
+                self.finished.emit(False, f"Error resetting repository: {str(e)}")
+                return
+
+            # Pull the latest changes
+            self.progress.emit("Pulling latest changes...")
+            old_head = repo.head.commit.hexsha
+            try:
+                if self.clone_strategy in ("shallow", "archive"):
+                    # A shallow history may not contain the merge base, so fetch the tip and reset to it
+                    repo.git.fetch('--depth', '1', 'origin', self.branch_name)
+                    repo.git.reset('--hard', 'FETCH_HEAD')
+                else:
+                    repo.remotes.origin.pull()
+            except GitCommandError as e:
+                self.finished.emit(False, f"Error pulling latest changes: {str(e)}")
+                return
+
+            # Update submodules
+            self.progress.emit("Updating submodules...")
+            try:
+                report = self.update_submodules(repo, old_head)
+            except GitCommandError as e:
+                self.finished.emit(False, f"Error updating submodules: {str(e)}")
+                return
+            if report["failed"]:
+                self.finished.emit(False, f"{len(report['failed'])} submodule(s) failed to update: {', '.join(report['failed'])}")
+                return
+
+            if self.deduplicate:
+                self.progress.emit("Sharing identical mod files with other modpacks...")
+                deduplicate_modpack(self.repo_path)
+
+            self.finished.emit(True, f"Modpack and submodules updated successfully.\nSubmodules: {format_reconcile_report(report)}.")
+        except GitCommandError as e:
+            self.finished.emit(False, f"Git error: {str(e)}")
+        except Exception as e:
+            self.finished.emit(False, f"Unexpected error: {str(e)}")
+
+    def update_submodules(self, repo, old_head):
+        """Reconcile the submodules with the pulled commit, fetching only the changed ones in parallel."""
+        if self.clone_strategy == "archive":
+            git_fetcher = SubmoduleFetcher(repo, self.submodule_jobs, submodule_update_args("archive"), self.on_submodule_event)
+            self.submodules_started = time.perf_counter()
+            report = sync_archive_mods(repo, ArchiveModFetcher(repo, self.submodule_jobs, self.on_submodule_event, git_fetcher))
+            self.progress.emit(f"Mods updated: {format_reconcile_report(report)}.")
+            return report
+        object_store = ensure_object_store() if self.clone_strategy == "full" else None
+        fetcher = SubmoduleFetcher(repo, self.submodule_jobs, submodule_update_args(self.clone_strategy), self.on_submodule_event, object_store)
+        self.submodules_started = time.perf_counter()
+        report = reconcile_submodules(repo, old_head, fetcher)
+        self.progress.emit(f"Submodules updated: {format_reconcile_report(report)}.")
+        return report
+
+    def on_submodule_event(self, event):
+        if event["state"] != "fetching" or not event["progress"]:
+            print(format_submodule_event(event))
+            self.progress.emit(format_submodule_event(event))
+        self.submodule_progress.emit(event)
+        self.transfer_progress.emit(submodule_transfer_event(event, self.submodules_started))
+
+############################################################
+# Content-addressed mod store
+############################################################
+
+blob_store_lock = threading.Lock()  # Linking into the store and collecting its garbage must not interleave
+
+def blob_path(store, digest):
+    return os.path.join(store, digest[:2], digest[2:])
+
+def load_blob_index(store):
+    try:
+        with open(os.path.join(store, BLOB_INDEX_NAME), "r") as f:
+            return dict(json.load(f))
+    except (OSError, ValueError, TypeError):
+        return {}
+
+def save_blob_index(store, index):
+    path = os.path.join(store, BLOB_INDEX_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(index, f)
+    os.replace(path + ".tmp", path)
+
+def deduplicate_files(root, store=BLOB_STORE_FOLDER, should_cancel=None):
+    """
+    Hard link every file under `root` into the content-addressed store, replacing files whose content
+    the store already has by a link to it, so identical mods of different modpacks share one copy on disk.
+    Paths do not change, so the modpack reads exactly as before. Git replaces files rather than writing
+    into them, so updating one modpack never changes another; stored copies are read-only against anything
+    else. Empty files, symlinks and anything named .git (submodule git folders and gitfiles) are left alone,
+    and so is a `root` on another drive than the store.
+    Returns:
+        dict: {"files", "hashed", "linked", "saved": bytes freed, "failed": [(path, error)]}
+    """
+    report = {"files": 0, "hashed": 0, "linked": 0, "saved": 0, "failed": []}
+    with blob_store_lock:
+        try:
+            os.makedirs(store, exist_ok=True)
+            same_drive = os.stat(root).st_dev == os.stat(store).st_dev
+        except OSError as e:
+            report["failed"].append((root, str(e)))
+            return report
+        if not same_drive:
+            print(f"Not deduplicating {root}: it is on another drive than {store}")
+            return report
+        index = load_blob_index(store)
+        stack = [root]
+        try:
+            while stack:
+                if should_cancel and should_cancel():
+                    break
+                folder = stack.pop()
+                try:
+                    with os.scandir(folder) as entries:
+                        for entry in entries:
+                            if entry.name == ".git":
+                                try:
+                                    unshare_git_file(entry.path)
+                                except OSError as e:
+                                    report["failed"].append((entry.path, str(e)))
+                                continue
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                                continue
+                            try:
+                                if not entry.is_file(follow_symlinks=False):
+                                    continue
+                                file_stat = entry.stat(follow_symlinks=False)
+                                if not file_stat.st_size:
+                                    continue
+                                report["files"] += 1
+                                link_into_store(entry.path, entry.inode(), file_stat, store, index, report)
+                            except OSError as e:
+                                report["failed"].append((entry.path, str(e)))
+                except OSError as e:
+                    report["failed"].append((folder, str(e)))  # An unreadable folder; the rest is still shared
+        finally:
+            try:
+                save_blob_index(store, index)
+            except OSError as e:
+                print(f"Could not save the blob index: {e}")
+    return report
+
+def unshare_git_file(path):
+    """
+    Give a submodule's gitfile a writable copy of its own if an earlier version of deduplicate_files linked
+    it into the store: git rewrites it in place, which would fail on the read-only stored copy.
+    """
+    if os.path.islink(path) or not os.path.isfile(path) or os.stat(path).st_nlink < 2:
+        return
+    temporary = path + ".unshare"
+    shutil.copyfile(path, temporary)
+    try:
+        os.replace(temporary, path)
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE)  # Read-only files (Windows) cannot be replaced
+        os.replace(temporary, path)
+
+def make_read_only(path, mode):
+    """Drop the write bits of a stored copy, so writing through any of its links fails instead of changing every modpack."""
+    if mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH):
+        os.chmod(path, stat.S_IMODE(mode) & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+def remove_blob(blob):
+    try:
+        os.remove(blob)
+    except PermissionError:
+        os.chmod(blob, stat.S_IWRITE)  # Read-only files cannot be deleted on Windows
+        os.remove(blob)
+
+def link_into_store(path, inode, file_stat, store, index, report):
+    """
+    Make one file a hard link of the store's copy of its content, adding the content first if it is new.
+    A stored copy is only trusted while its inode, size and mtime are the ones the index recorded for it;
+    otherwise it is hashed again, and discarded if its content no longer matches its name.
+    """
+    key = [file_stat.st_size, file_stat.st_mtime_ns]
+    cached = index.get(str(inode))
+    if cached and cached[:2] == key:
+        digest = cached[2]
+    else:
+        digest = file_digest(path)
+        report["hashed"] += 1
+    blob = blob_path(store, digest)
+    try:
+        blob_stat = os.stat(blob)
+    except FileNotFoundError:
+        blob_stat = None
+    if blob_stat and blob_stat.st_ino != inode and index.get(str(blob_stat.st_ino)) != [blob_stat.st_size, blob_stat.st_mtime_ns, digest]:
+        # Changed since it was stored, e.g. written through one of its links before it was made read-only
+        report["hashed"] += 1
+        if file_digest(blob) != digest:
+            print(f"Discarding stored copy {blob}: its content no longer matches")
+            remove_blob(blob)
+            blob_stat = None
+    if blob_stat is None or blob_stat.st_ino == inode:
+        if blob_stat is None:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            os.link(path, blob)  # New content: this file becomes the store's copy
+        make_read_only(blob, file_stat.st_mode)
+        index[str(inode)] = key + [digest]
+        return
+    # The file takes the stored copy's mtime; plan_mod_install recognizes it by its hash (see stored_digest)
+    make_read_only(blob, blob_stat.st_mode)
+    temporary = path + ".blob-link"
+    os.link(blob, temporary)
+    try:
+        os.replace(temporary, path)
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE)  # Read-only files (Windows) cannot be replaced
+        os.replace(temporary, path)
+    index[str(blob_stat.st_ino)] = [blob_stat.st_size, blob_stat.st_mtime_ns, digest]
+    report["linked"] += 1
+    report["saved"] += file_stat.st_size
+
+def stored_digest(path, file_stat, index):
+    """
+    SHA-1 of a file that is a link into the store, looked up in the store's index (see load_blob_index),
+    or None if it is not one or changed since it was indexed.
+    """
+    inode = file_stat.st_ino or os.stat(path).st_ino  # Directory entries carry no inode on Windows
+    entry = index.get(str(inode))
+    if entry and entry[:2] == [file_stat.st_size, file_stat.st_mtime_ns]:
+        return entry[2]
+    return None
+
+def collect_blob_garbage(store=BLOB_STORE_FOLDER):
+    """
+    Delete stored content that no modpack or install links to any more (a link count of one: the store's own).
+    Returns:
+        tuple: (blobs deleted, bytes freed)
+    """
+    deleted, freed = 0, 0
+    with blob_store_lock:
+        if not os.path.isdir(store):
+            return deleted, freed
+        index = load_blob_index(store)
+        kept = set()
+        for prefix in os.listdir(store):
+            folder = os.path.join(store, prefix)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                blob_stat = os.stat(path)  # Not a directory entry's stat: Windows leaves st_nlink out of those
+                if blob_stat.st_nlink > 1:
+                    kept.add(str(blob_stat.st_ino))
+                    continue
+                try:
+                    os.remove(path)
+                except PermissionError:
+                    os.chmod(path, stat.S_IWRITE)
+                    os.remove(path)
+                deleted += 1
+                freed += blob_stat.st_size
+            if not os.listdir(folder):
+                os.rmdir(folder)
+        save_blob_index(store, {inode: entry for inode, entry in index.items() if inode in kept})
+    return deleted, freed
+
+def deduplicate_modpack(repo_path, should_cancel=None):
+    """
+    Share the mod files of a downloaded modpack through the store, then drop content nothing uses any more.
+    Never raises: the modpack is complete either way, so a failure only costs the disk space it would have saved.
+    Returns:
+        dict: The deduplicate_files report, or None if deduplicating failed.
+    """
+    start = time.perf_counter()
+    mods_src = os.path.join(repo_path, "Mods")
+    try:
+        report = deduplicate_files(mods_src if os.path.isdir(mods_src) else repo_path, should_cancel=should_cancel)
+        deleted, freed = collect_blob_garbage()
+    except Exception as e:
+        print(f"Could not deduplicate {repo_path}: {e}")
+        return None
+    print(f"Deduplicated {repo_path}: {report['linked']} of {report['files']} file(s) shared, {format_bytes(report['saved'])} saved, "
+          f"{report['hashed']} hashed, {len(report['failed'])} failed; removed {deleted} unused blob(s) ({format_bytes(freed)}) "
+          f"in {time.perf_counter() - start:.2f} s")
+    return report
+
+############################################################
+# Background folder deletion
+############################################################
+
+pending_deletions_lock = threading.Lock()  # Guards PENDING_DELETIONS_FILE; workers and the GUI thread both add tombstones
+
+def load_pending_deletions():
+    """Tombstones registered in PENDING_DELETIONS_FILE, whether or not they still exist."""
+    try:
+        with open(PENDING_DELETIONS_FILE, "r") as f:
+            return [path for path in json.load(f) if isinstance(path, str)]
+    except (OSError, ValueError, TypeError):
+        return []
+
+def save_pending_deletions(paths):
+    with open(PENDING_DELETIONS_FILE + ".tmp", "w") as f:
+        json.dump(paths, f, indent=2)
+    os.replace(PENDING_DELETIONS_FILE + ".tmp", PENDING_DELETIONS_FILE)
+
+def pending_deletions():
+    """Registered tombstones that still have to be deleted; ones already gone are dropped from the file."""
+    with pending_deletions_lock:
+        paths = load_pending_deletions()
+        remaining = [path for path in paths if os.path.lexists(path)]
+        if remaining != paths:
+            save_pending_deletions(remaining)
+    return remaining
+
+def tombstone_folder(path, parent=None):
+    """
+    Move a folder out of the way under a tombstone name with one atomic rename, and register it for
+    deletion by FolderDeletionWorker, now or after the next launch if this session ends first.
+    Args:
+        parent (str): Folder to put the tombstone in; by default next to `path`. Must be on the same drive.
+    Returns:
+        str: The tombstone path.
+    Raises:
+        OSError: If the folder cannot be renamed, e.g. because a file in it is open (Windows).
+    """
+    parent = parent or os.path.dirname(os.path.abspath(path))
+    tombstone = os.path.join(parent, f"{os.path.basename(os.path.normpath(path))}{TOMBSTONE_INFIX}{time.strftime('%Y%m%d-%H%M%S')}")
+    candidate, counter = tombstone, 1
+    with pending_deletions_lock:
+        while os.path.lexists(candidate):
+            candidate = f"{tombstone}-{counter}"
+            counter += 1
+        # Registered before the rename, so a crash in between still gets it cleaned up
+        paths = load_pending_deletions()
+        save_pending_deletions(paths + [candidate])
+        try:
+            os.rename(path, candidate)
+        except OSError:
+            save_pending_deletions(paths)
+            raise
+    return candidate
+
+def delete_tombstone(tombstone, on_progress=None, should_cancel=None):
+    """
+    Delete a tombstoned folder and unregister it. Its files are listed with os.scandir first,
+    so progress can be reported while they are deleted.
+    Args:
+        on_progress (callable): Called with (files deleted, files in total).
+        should_cancel (callable): Polled between files; returning True stops, leaving the tombstone registered.
+    Returns:
+        bool: True once deleted, False if cancelled.
+    Raises:
+        OSError: If something in it cannot be deleted; it stays registered and is retried next launch.
+    """
+    if os.path.isdir(tombstone) and not os.path.islink(tombstone):
+        files, directories = [], []
+        stack = [tombstone]
+        while stack:
+            path = stack.pop()
+            directories.append(path)
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        files.append((entry.path, entry.is_symlink()))
+        for done, (path, is_link) in enumerate(files, start=1):
+            if should_cancel and should_cancel():
+                return False
+            if is_link:
+                remove_link(path)  # Symlinked mod folders: never follow into the modpack
+            else:
+                try:
+                    os.remove(path)
+                except PermissionError:
+                    os.chmod(path, stat.S_IWRITE)
+                    os.remove(path)
+            if on_progress:
+                on_progress(done, len(files))
+        for path in reversed(directories):  # Children were listed after their parents
+            os.rmdir(path)
+    elif os.path.lexists(tombstone):
+        os.remove(tombstone)
+    with pending_deletions_lock:
+        save_pending_deletions([path for path in load_pending_deletions() if path != tombstone])
+    return True
+
+class FolderDeletionWorker(QThread):
+    """Deletes queued tombstones one after another; QThread.finished is emitted once the queue runs dry."""
+    deleted = pyqtSignal(str, str)  # Tombstone, error message ("" once deleted)
+    progress = pyqtSignal(int, int)  # Files deleted, files in the tombstone being deleted
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.queue = []
+        self.current = None
+        self.active = False
+        self.cancelled = False
+        self.last_emit = 0.0
+
+    def cancel(self):
+        """Stop after the file being deleted; what is left stays registered and is deleted on the next launch."""
+        self.cancelled = True
+
+    def add(self, tombstone):
+        """
+        Queue a tombstone for deletion.
+        Returns:
+            bool: True if the worker is idle and has to be started.
+        """
+        with self.lock:
+            if tombstone == self.current or tombstone in self.queue:
+                return False
+            self.queue.append(tombstone)
+            idle = not self.active
+            self.active = True
+        return idle
+
+    def run(self):
+        while True:
+            with self.lock:
+                if not self.queue:
+                    self.current = None
+                    self.active = False
+                    return
+                self.current = self.queue.pop(0)
+            try:
+                if not delete_tombstone(self.current, self.on_progress, lambda: self.cancelled):
+                    print(f"Stopped deleting {self.current}, continuing on next launch")
+                    with self.lock:
+                        self.queue.clear()
+                    continue
+                print(f"Deleted {self.current}")
+                self.deleted.emit(self.current, "")
+            except OSError as e:
+                print(f"Could not delete {self.current}, retrying on next launch: {e}")
+                self.deleted.emit(self.current, str(e))
+
+    def on_progress(self, done, total):
+        now = time.perf_counter()
+        if done < total and now - self.last_emit < 0.1:
+            return
+        self.last_emit = now
+        self.progress.emit(done, total)
+
+############################################################
+# Differential mod installs
+############################################################
+
+def file_digest(path):
+    """SHA-1 of a file's content, read in chunks."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def copy_with_digest(source, destination):
+    """Copy a file with its timestamps (like shutil.copy2) and return the SHA-1 of the copied content."""
+    digest = hashlib.sha1()
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        for chunk in iter(lambda: src.read(1024 * 1024), b""):
+            digest.update(chunk)
+            dst.write(chunk)
+    shutil.copystat(source, destination)
+    return digest.hexdigest()
+
+def load_install_manifest(mods_dir):
+    """
+    Read the manifest of what was installed into a Mods folder.
+    Returns:
+        dict: {"files": {relative path: [size, mtime_ns, sha1 or None]}, "links": {mod: symlinked source folder},
+            "pack": modpack folder the install is of, or None if not recorded}
+    """
+    try:
+        with open(os.path.join(mods_dir, INSTALL_MANIFEST_NAME), "r") as f:
+            manifest = json.load(f)
+        return {"files": dict(manifest.get("files", {})), "links": dict(manifest.get("links", {})), "pack": manifest.get("pack")}
+    except (OSError, ValueError, AttributeError, TypeError):
+        return {"files": {}, "links": {}, "pack": None}
+
+def save_install_manifest(mods_dir, manifest):
+    path = os.path.join(mods_dir, INSTALL_MANIFEST_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"version": 1, "pack": manifest.get("pack"), "files": manifest["files"], "links": manifest["links"]}, f)
+    os.replace(path + ".tmp", path)
+
+def remove_link(path):
+    """Delete a symlink itself, never its target (Windows removes directory links with rmdir)."""
+    if system_platform == "Windows" and os.path.isdir(path):
+        os.rmdir(path)
+    else:
+        os.unlink(path)
+
+def reflink_file(source, destination):
+    """
+    Clone a file copy-on-write: the copy shares the source's blocks until either is modified.
+    Raises:
+        OSError: If the platform or filesystem cannot clone (e.g. ext4, NTFS, or across devices).
+    """
+    if system_platform == "Linux":
+        import fcntl  # POSIX only
+        try:
+            with open(source, "rb") as src, open(destination, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            if os.path.exists(destination):
+                os.remove(destination)
+            raise
+    elif system_platform == "Darwin":
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(source), os.fsencode(destination), 0) != 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), destination)
+    else:
+        raise OSError(errno.EOPNOTSUPP, "Copy-on-write clones are not supported on this platform", destination)
+    shutil.copystat(source, destination)
+
+def keep_writable(path):
+    """Give a copied file write permission again when its source was read-only, e.g. a stored copy (see make_read_only)."""
+    mode = os.stat(path).st_mode
+    if not mode & stat.S_IWUSR:
+        os.chmod(path, stat.S_IMODE(mode) | stat.S_IWUSR)
+
+class FileMaterializer:
+    """
+    Places modpack files into the Mods folder with an install mode from INSTALL_MODES.
+    When the filesystem refuses the mode (no reflink support, a cross-device hard link,
+    no symlink privilege on Windows), it falls back along FALLBACKS for the rest of the install.
+    Safe to share between the threads of an install.
+    """
+    FALLBACKS = {"symlink": "hardlink", "hardlink": "copy", "reflink": "copy"}
+
+    def __init__(self, mode=DEFAULT_INSTALL_MODE):
+        self.mode = mode if mode in INSTALL_MODES else DEFAULT_INSTALL_MODE
+        self.lock = threading.Lock()
+
+    def fall_back(self, mode, error):
+        with self.lock:
+            if self.mode != mode:
+                return  # Another thread already fell back
+            self.mode = self.FALLBACKS[mode]
+        print(f"Install mode '{mode}' is not available here ({error}), using '{self.mode}' instead")
+
+    def link_mod(self, source_root, installed_root):
+        """Symlink a whole mod folder. Returns False if the caller should place its files instead."""
+        if self.mode != "symlink":
+            return False
+        try:
+            os.symlink(source_root, installed_root, target_is_directory=True)
+            return True
+        except (OSError, NotImplementedError) as e:
+            self.fall_back("symlink", e)
+            return False
+
+    def place(self, source, destination):
+        """
+        Materialize one file, replacing whatever is at destination.
+        Returns:
+            str: SHA-1 of the content for copies and reflinks, else None (hard links share the
+                modpack's inode, so their size and mtime already track the source).
+        """
+        if os.path.lexists(destination):
+            # Never write through the old file: it may be a hard link into the modpack
+            try:
+                os.remove(destination)
+            except PermissionError:
+                os.chmod(destination, stat.S_IWRITE)
+                os.remove(destination)
+        mode = self.mode
+        if mode == "hardlink" and is_written_by_mods(destination):
+            mode = "copy"  # A link would share the mod's settings with the modpack, or be a read-only stored copy
+        while mode in ("hardlink", "reflink"):
+            try:
+                if mode == "hardlink":
+                    os.link(source, destination)
+                    return None
+                reflink_file(source, destination)
+            except OSError as e:
+                if e.errno in (errno.ENOSPC, errno.ENOENT, getattr(errno, "EDQUOT", errno.ENOSPC)):
+                    raise  # A real failure, not an unsupported mode
+                self.fall_back(mode, e)
+                mode = self.mode
+                continue
+            keep_writable(destination)
+            # Reading the clone is cheap next to re-placing it, and lets a touched source be kept later
+            return file_digest(destination)
+        digest = copy_with_digest(source, destination)
+        keep_writable(destination)
+        return digest
+
+def is_written_by_mods(path):
+    """Whether a file is one mods rewrite in place (MOD_WRITTEN_FILES), so installs must not hard link it."""
+    name = os.path.basename(path).lower()
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in MOD_WRITTEN_FILES)
+
+def is_ignored(rel_path, patterns):
+    """
+    Whether a path inside a mod ('/'-separated, relative to the mod folder) is excluded from installs.
+    Patterns are case-insensitive fnmatch patterns, matched against the file or folder name, or against
+    the whole relative path if they contain a '/'. A leading '!' re-includes; like .gitignore, the last
+    matching pattern wins, and an ignored folder excludes everything in it.
+    """
+    name = rel_path.rsplit("/", 1)[-1].lower()
+    ignored = False
+    for pattern in patterns:
+        negate = pattern.startswith("!")
+        body = (pattern[1:] if negate else pattern).strip("/").lower()
+        if body and fnmatch.fnmatchcase(rel_path.lower() if "/" in body else name, body):
+            ignored = not negate
+    return ignored
+
+def load_ignore_table(global_patterns, repo_path):
+    """
+    Combine the global ignore patterns with the modpack's PACK_IGNORE_FILE overrides.
+    Returns:
+        dict: {"*": patterns for every mod, "<mod>": extra patterns for that mod}
+    """
+    table = {"*": list(global_patterns)}
+    try:
+        with open(os.path.join(repo_path, PACK_IGNORE_FILE), "r") as f:
+            overrides = json.load(f)
+    except FileNotFoundError:
+        return table
+    except (OSError, ValueError) as e:
+        print(f"Ignoring invalid {PACK_IGNORE_FILE} in {repo_path}: {e}")
+        return table
+    if isinstance(overrides, dict):
+        for key, patterns in overrides.items():
+            if isinstance(patterns, list):
+                table[key] = table.get(key, []) + [str(pattern) for pattern in patterns]
+    return table
+
+def mod_ignore_patterns(ignore, mod):
+    """The ignore patterns that apply to one mod, in the order they are evaluated."""
+    if not ignore:
+        return []
+    return ignore.get("*", []) + ignore.get(mod, [])
 
-                # Verify the file size after download
-                if downloaded_size != total_size:
-                    self.finished.emit(False, "File download failed: Incomplete file.")
-                    return
+def scan_mod_files(mods_src, mod, patterns=()):
+    """
+    List one mod of a modpack with os.scandir, keyed the way the install manifest is, leaving out ignored paths.
+    The stats come from the directory entries; on Windows they carry no st_ino/st_dev.
+    Returns:
+        tuple: ({relative path: os.stat_result} of its files, [relative paths of its directories])
+    Raises:
+        FileNotFoundError: If the mod is not in the modpack.
+    """
+    root = os.path.join(mods_src, mod)
+    if os.path.isfile(root):
+        return {mod: os.stat(root)}, []
+    if not os.path.isdir(root):
+        raise FileNotFoundError(f"{mod} is not part of this modpack")
+    files, directories = {}, []
+    stack = [(root, mod)]
+    while stack:
+        path, rel_dir = stack.pop()
+        directories.append(rel_dir)
+        in_mod = rel_dir[len(mod) + 1:]  # Path inside the mod folder, "" for its root
+        prefix = in_mod + "/" if in_mod else ""
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if is_ignored(prefix + entry.name, patterns):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, f"{rel_dir}/{entry.name}"))
+                elif not entry.is_dir():  # Symlinked folders inside a mod are not walked into
+                    files[f"{rel_dir}/{entry.name}"] = entry.stat()
+    return files, directories
+
+def list_installed_files(mods_dir, mod):
+    """Relative paths of every file under an installed mod folder, found with os.scandir."""
+    found = []
+    stack = [(os.path.join(mods_dir, mod), mod)]
+    while stack:
+        path, rel_dir = stack.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{rel_dir}/{entry.name}"))
+                    else:
+                        found.append(f"{rel_dir}/{entry.name}")
+        except NotADirectoryError:
+            found.append(rel_dir)
+        except FileNotFoundError:
+            pass
+    return found
 
-                # Unzip if necessary
-                if zipfile.is_zipfile(local_file_path):
+def remove_installed_file(mods_dir, rel_path):
+    """Delete an installed file and any directories it leaves empty, up to the Mods folder."""
+    path = os.path.join(mods_dir, *rel_path.split("/"))
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE)
+        os.remove(path)
+    parent = os.path.dirname(path)
+    while os.path.normcase(parent) != os.path.normcase(mods_dir):
+        try:
+            os.rmdir(parent)
+        except OSError:
+            break  # Not empty
+        parent = os.path.dirname(parent)
+
+def existing_ancestor(path):
+    """The closest folder at or above `path` that exists."""
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+def effective_install_mode(mode, mods_src, mods_dir):
+    """
+    The install mode an install into mods_dir can really use, decided up front so a plan stays valid:
+    symlinks need the privilege to create them (Windows), hard links need the modpack on the same drive.
+    Reflinks are only known to work once tried, and fall back to copies while installing.
+    """
+    mode = mode if mode in INSTALL_MODES else DEFAULT_INSTALL_MODE
+    anchor = existing_ancestor(mods_dir)
+    if mode == "symlink":
+        probe = os.path.join(anchor, f".symlink-probe-{os.getpid()}")
+        try:
+            os.symlink(os.path.abspath(mods_src), probe, target_is_directory=True)
+            remove_link(probe)
+        except (OSError, NotImplementedError) as e:
+            mode = FileMaterializer.FALLBACKS["symlink"]
+            print(f"Install mode 'symlink' is not available here ({e}), using '{mode}' instead")
+    if mode == "hardlink":
+        try:
+            same_drive = os.stat(mods_src).st_dev == os.stat(anchor).st_dev
+        except OSError:
+            same_drive = False
+        if not same_drive:
+            mode = FileMaterializer.FALLBACKS["hardlink"]
+            print(f"Install mode 'hardlink' is not available here (the modpack is on another drive), using '{mode}' instead")
+    return mode
+
+def plan_mod_install(mods_src, mods_dir, mods, mirror=False, mode=DEFAULT_INSTALL_MODE, ignore=None, pack=None,
+                     on_progress=None, should_cancel=None):
+    """
+    Work out what installing mods from a modpack's Mods folder into mods_dir would change, without writing anything.
+    Each mod is walked once with os.scandir; execute_install_plan then runs the plan as it is.
+    A file is left alone when the installed copy still has the size and mtime it was installed with;
+    a source that was only touched keeps its installed copy when the content hash still matches
+    (for files shared through the content-addressed store, the store's index already has the hash).
+    Files the manifest recorded for an installed mod that are gone from the modpack are deleted.
+    With `mirror`, everything in mods_dir that is not part of `mods` is deleted as well.
+    Paths matching the `ignore` table (see load_ignore_table) are not installed, and removed if an
+    earlier install placed them; symlinked mod folders cannot leave anything out.
+    Args:
+        pack (str): Modpack folder name recorded in the manifest, so the install can be parked and switched back to.
+        on_progress (callable): Called with {"stage": "scanning", "mod", "index", "total", ...} for every mod.
+        should_cancel (callable): Polled between mods; returning True stops planning.
+    Returns:
+        dict: {"mods_src", "target", "mods", "mirror", "mode", "pack",
+            "keep": {path: manifest entry} of unchanged files, "keep_links": {mod: source} of unchanged symlinked mods,
+            "touch": [(path, (atime_ns, mtime_ns), entry)], "unlink": [mod], "link": [(mod, source, replaced)],
+            "delete": [(mod, path)], "delete_top": [name], "directories": [path],
+            "place": [(mod, path, [size, mtime_ns], is_new)], "bytes": bytes to place, "unchanged": count,
+            "mod_sizes": {mod: [bytes, files]}, "manifest_changed": bool, "failed": [(mod, error)], "cancelled": bool}
+    """
+    mode = effective_install_mode(mode, mods_src, mods_dir)
+    manifest = load_install_manifest(mods_dir)
+    store_index = load_blob_index(BLOB_STORE_FOLDER)  # Hashes of modpack files shared through the store
+    old_files, old_links = manifest["files"], manifest["links"]
+    old_by_mod = {}
+    for rel_path in old_files:
+        old_by_mod.setdefault(rel_path.split("/", 1)[0], []).append(rel_path)
+    mods = list(mods)
+    plan = {"mods_src": mods_src, "target": mods_dir, "mods": mods, "mirror": mirror, "mode": mode, "pack": pack,
+            "keep": {}, "keep_links": {}, "touch": [], "unlink": [], "link": [], "delete": [], "delete_top": [],
+            "directories": [], "place": [], "bytes": 0, "unchanged": 0, "mod_sizes": {}, "manifest_changed": False,
+            "failed": [], "cancelled": False}
+    progress = {"stage": "scanning", "mod": "", "index": 0, "total": len(mods),
+                "files_done": 0, "files_total": 0, "bytes_done": 0, "bytes_total": 0}
+
+    for index, mod in enumerate(mods, start=1):
+        if should_cancel and should_cancel():
+            plan["cancelled"] = True
+            return plan
+        progress.update(mod=mod, index=index)
+        if on_progress:
+            on_progress(dict(progress))
+        try:
+            source_root = os.path.abspath(os.path.join(mods_src, mod))
+            installed_root = os.path.join(mods_dir, mod)
+            installed_link = os.path.islink(installed_root)
+
+            if mode == "symlink" and os.path.isdir(source_root):
+                if installed_link and os.readlink(installed_root) == source_root:
+                    plan["keep_links"][mod] = source_root
+                    plan["unchanged"] += 1
+                    continue
+                replaced = "link" if installed_link else "folder" if os.path.isdir(installed_root) \
+                    else "file" if os.path.lexists(installed_root) else None
+                plan["link"].append((mod, source_root, replaced))
+                continue
+            if installed_link:
+                plan["unlink"].append(mod)  # Previously installed as a symlink; nothing below it is an installed file
+
+            source_files, directories = scan_mod_files(mods_src, mod, mod_ignore_patterns(ignore, mod))
+            for rel_dir in directories:
+                if installed_link or not os.path.isdir(os.path.join(mods_dir, *rel_dir.split("/"))):
+                    plan["directories"].append(rel_dir)
+
+            mod_bytes = 0
+            for rel_path, source_stat in source_files.items():
+                mod_bytes += source_stat.st_size
+                destination = os.path.join(mods_dir, *rel_path.split("/"))
+                dest_stat = None
+                if not installed_link:
                     try:
-                        with zipfile.ZipFile(local_file_path, 'r') as zip_ref:
-                            zip_ref.extractall(self.repo_name)
-                        os.remove(local_file_path)
-                    except zipfile.BadZipFile:
-                        self.finished.emit(False, "File download failed: Corrupt ZIP file.")
-                        return
-
-                # If file download succeeds, emit success
-                self.finished.emit(True, f"Successfully downloaded {self.repo_name}.")
+                        dest_stat = os.stat(destination)
+                    except OSError:
+                        pass
+                exists = dest_stat is not None
+                entry = old_files.get(rel_path)
+                source_key = [source_stat.st_size, source_stat.st_mtime_ns]
+                source_path = os.path.join(mods_src, *rel_path.split("/"))
+                if dest_stat and mode == "hardlink" and not is_written_by_mods(rel_path):
+                    if not source_stat.st_ino:
+                        source_stat = os.stat(source_path)  # Directory entries carry no inode on Windows
+                    if not os.path.samestat(source_stat, dest_stat):
+                        dest_stat = None  # A copy from another install mode; replace it with a link
+
+                if dest_stat and [dest_stat.st_size, dest_stat.st_mtime_ns] == source_key:
+                    # Installed file matches the source (copies and clones keep the source mtime, links share it)
+                    plan["keep"][rel_path] = source_key + [entry[2] if entry and entry[:2] == source_key else None]
+                    plan["unchanged"] += 1
+                    continue
+                if entry and entry[2] and dest_stat and [dest_stat.st_size, dest_stat.st_mtime_ns] == entry[:2] \
+                        and source_stat.st_size == entry[0]:
+                    digest = stored_digest(source_path, source_stat, store_index)
+                    if digest == entry[2]:
+                        # Shared through the store, which took its mtime; its hash is known, so keep the installed copy as is
+                        plan["keep"][rel_path] = entry
+                        plan["unchanged"] += 1
+                        continue
+                    if digest is None and file_digest(source_path) == entry[2]:
+                        # Source was only touched (e.g. by a checkout); carry its mtime over instead of copying
+                        plan["touch"].append((rel_path, (source_stat.st_atime_ns, source_stat.st_mtime_ns), source_key + [entry[2]]))
+                        plan["unchanged"] += 1
+                        continue
+                plan["place"].append((mod, rel_path, source_key, not exists))
+                plan["bytes"] += source_stat.st_size
+            plan["mod_sizes"][mod] = [mod_bytes, len(source_files)]
+
+            # Files this mod no longer ships
+            deleted = {rel_path for rel_path in old_by_mod.get(mod, []) if rel_path not in source_files}
+            if mirror and not installed_link:
+                # Also drop files in the installed mod that were never part of it
+                deleted.update(rel_path for rel_path in list_installed_files(mods_dir, mod) if rel_path not in source_files)
+            plan["delete"].extend((mod, rel_path) for rel_path in sorted(deleted))
+        except OSError as e:
+            plan["failed"].append((mod, str(e)))
+
+    if mirror and os.path.isdir(mods_dir):
+        keep = set(mods) | {INSTALL_MANIFEST_NAME, STAGED_COMPLETE_MARKER}
+        plan["delete_top"] = sorted(name for name in os.listdir(mods_dir) if name not in keep)
+    plan["manifest_changed"] = any(old_files.get(rel_path) != entry for rel_path, entry in plan["keep"].items()) \
+        or any(old_links.get(mod) != source for mod, source in plan["keep_links"].items()) or manifest["pack"] != pack
+    return plan
+
+def install_plan_changes(plan):
+    """Whether executing a plan would change anything on disk or in the install manifest, or swap in another install."""
+    return bool(plan.get("base", "live") != "live" or plan["manifest_changed"] or any(plan[key] for key in
+                ("touch", "unlink", "link", "delete", "delete_top", "directories", "place")))
+
+def execute_install_plan(plan, mods_dir, jobs=DEFAULT_INSTALL_JOBS, on_progress=None, should_cancel=None):
+    """
+    Carry out a plan from plan_mod_install in mods_dir: the folder it was planned against, or an exact
+    copy of it (see seed_staging_tree). Nothing is scanned again; the files to place are written by a
+    pool of `jobs` threads, as small files are bound by I/O latency rather than bandwidth.
+    Args:
+        on_progress (callable): Called from the pool threads with {"stage": "installing", "mod", "index", "total",
+            "files_done", "files_total", "bytes_done", "bytes_total"}.
+        should_cancel (callable): Polled between steps and files; returning True stops the install.
+    Returns:
+        dict: {"copied", "linked", "deleted", "unchanged", "bytes", "failed": [(mod, error)], "cancelled": bool,
+            "mode", "seconds": time spent placing files}
+    """
+    os.makedirs(mods_dir, exist_ok=True)
+    manifest = load_install_manifest(mods_dir)
+    files, links = manifest["files"], manifest["links"]
+    materializer = FileMaterializer(plan["mode"])
+    report = {"copied": 0, "linked": 0, "deleted": 0, "unchanged": plan["unchanged"], "bytes": 0,
+              "failed": list(plan["failed"]), "cancelled": False, "seconds": 0.0}
+    lock = threading.Lock()
+    progress = {"stage": "installing", "mod": "", "index": len(plan["mods"]), "total": len(plan["mods"]),
+                "files_done": 0, "files_total": len(plan["place"]), "bytes_done": 0, "bytes_total": plan["bytes"]}
+
+    def cancelled():
+        report["cancelled"] = report["cancelled"] or bool(should_cancel and should_cancel())
+        return report["cancelled"]
+
+    def forget_mod(mod):
+        for rel_path in [path for path in files if path == mod or path.startswith(mod + "/")]:
+            del files[rel_path]
+
+    def place(item):
+        mod, rel_path, source_key, _ = item
+        if should_cancel and should_cancel():
+            return
+        source_path = os.path.join(plan["mods_src"], *rel_path.split("/"))
+        try:
+            digest = materializer.place(source_path, os.path.join(mods_dir, *rel_path.split("/")))
+        except OSError as e:
+            with lock:
+                report["failed"].append((mod, f"{rel_path}: {e}"))
+            return
+        with lock:
+            files[rel_path] = source_key + [digest]
+            report["copied"] += 1
+            report["bytes"] += source_key[0]
+            progress.update(mod=mod, files_done=progress["files_done"] + 1, bytes_done=progress["bytes_done"] + source_key[0])
+            event = dict(progress)
+        if on_progress:
+            on_progress(event)
 
-        except Exception as e:
-            self.finished.emit(False, f"An unexpected error occurred: {str(e)}")
+    try:
+        if cancelled():
+            return report
+        files.update(plan["keep"])
+        for mod in plan["mods"]:
+            if mod not in plan["keep_links"]:
+                links.pop(mod, None)
+        links.update(plan["keep_links"])
+
+        for rel_path, times, entry in plan["touch"]:
+            path = os.path.join(mods_dir, *rel_path.split("/"))
+            if os.stat(path).st_nlink > 1:
+                # Shared with the live install or a rollback generation (see seed_staging_tree):
+                # give the staged file an inode of its own rather than retiming theirs
+                temporary = path + ".tmp"
+                shutil.copy2(path, temporary)
+                os.replace(temporary, path)
+            os.utime(path, ns=times)
+            files[rel_path] = entry
+
+        for mod in plan["unlink"]:
+            remove_link(os.path.join(mods_dir, mod))
+
+        for mod, source_root, replaced in plan["link"]:
+            if cancelled():
+                return report
+            installed_root = os.path.join(mods_dir, mod)
+            try:
+                if replaced == "link":
+                    remove_link(installed_root)
+                elif replaced == "folder":
+                    tombstone_folder(installed_root, os.path.dirname(mods_dir))
+                    report["deleted"] += 1
+                elif replaced == "file":
+                    os.remove(installed_root)
+                forget_mod(mod)  # Before linking, so no stale entry ever points through the link
+                if not materializer.link_mod(source_root, installed_root):
+                    raise OSError(errno.EPERM, "Could not create a symlink to the mod folder", installed_root)
+                links[mod] = source_root
+                report["linked"] += 1
+            except OSError as e:
+                report["failed"].append((mod, str(e)))
+
+        for mod, rel_path in plan["delete"]:
+            try:
+                remove_installed_file(mods_dir, rel_path)
+                files.pop(rel_path, None)
+                report["deleted"] += 1
+            except OSError as e:
+                report["failed"].append((mod, f"{rel_path}: {e}"))
+
+        for rel_dir in plan["directories"]:
+            os.makedirs(os.path.join(mods_dir, *rel_dir.split("/")), exist_ok=True)
+
+        if plan["place"] and not cancelled():
+            for _, rel_path, _, _ in plan["place"]:
+                files.pop(rel_path, None)  # Recorded again once placed
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=max(1, int(jobs))) as executor:
+                list(executor.map(place, plan["place"]))
+            report["seconds"] = time.perf_counter() - start
+            cancelled()
+
+        if plan["mirror"] and not cancelled():
+            for name in plan["delete_top"]:
+                path = os.path.join(mods_dir, name)
+                if os.path.islink(path):
+                    remove_link(path)
+                elif os.path.isdir(path):
+                    tombstone_folder(path, os.path.dirname(mods_dir))  # Outside the install, deleted in the background
+                elif os.path.lexists(path):
+                    os.remove(path)
+                report["deleted"] += 1
+                forget_mod(name)
+                links.pop(name, None)
+    finally:
+        save_install_manifest(mods_dir, {"files": files, "links": links, "pack": plan["pack"]})
+        report["mode"] = materializer.mode
+    return report
+
+def new_generation_path(mods_dir):
+    """A fresh, sortable name for keeping a replaced install next to the Mods folder."""
+    path = f"{mods_dir}{GENERATION_INFIX}{time.strftime('%Y%m%d-%H%M%S')}"
+    candidate, counter = path, 1
+    while os.path.lexists(candidate):
+        candidate = f"{path}-{counter}"
+        counter += 1
+    return candidate
+
+def install_generations(mods_dir):
+    """Previous installs kept for rollback, newest first."""
+    parent, name = os.path.split(mods_dir)
+    try:
+        entries = [entry for entry in os.listdir(parent) if entry.startswith(name + GENERATION_INFIX) and TOMBSTONE_INFIX not in entry]
+    except OSError:
+        return []
+    return [os.path.join(parent, entry) for entry in sorted(entries, reverse=True)]
 
-    def read_git_output(self):
-        """Capture real-time output from the Git process."""
-        output = bytes(self.process.readAllStandardOutput()).decode('utf-8')
-        print(output)  # Optionally, update your GUI log or console with this output
-
-    def git_finished(self):
-        """Callback for handling the QProcess finish signal for Git operations."""
-        # Capture standard output and error messages
-        output = self.process.readAllStandardOutput().data().decode('utf-8').strip()
-        error_msg = self.process.readAllStandardError().data().decode('utf-8').strip()
-
-        # Check for actual error conditions
-        if self.process.exitCode() == 0 and self.process.error() == QProcess.ProcessError.UnknownError:
-            # Success case: Repository should exist
-            if os.path.exists(self.repo_name) and os.listdir(self.repo_name):
-                self.finished.emit(True, f"Successfully cloned {self.repo_name}.")
-            else:
-                # Handle unexpected case where the repo doesn't exist after a 'successful' clone
-                self.finished.emit(False, f"Git clone succeeded but the folder {self.repo_name} is empty.")
-        else:
-            # Error case: Provide more detailed output
-            error_detail = error_msg if error_msg else (output if output else "An unknown error occurred.")
-            self.finished.emit(False, f"Git clone failed: {error_detail}")
+def prune_install_generations(mods_dir, keep):
+    """Tombstone all but the newest `keep` generations for background deletion."""
+    for path in install_generations(mods_dir)[max(0, keep):]:
+        print(f"Removing old install generation: {path}")
+        tombstone_folder(path)
 
-        self.process.readyReadStandardOutput.connect(self.capture_stdout)
-        self.process.readyReadStandardError.connect(self.capture_stderr)
+def seed_staging_tree(live_dir, staging, jobs=DEFAULT_INSTALL_JOBS):
+    """
+    Fill a staging folder with hard links to every file of the live install, so the differential
+    install only writes what changed. The live files are never written through: FileMaterializer
+    unlinks before placing, and the manifest is replaced rather than rewritten.
+    Falls back to copies where hard links are unsupported.
+    """
+    materializer = FileMaterializer("hardlink")
+    pending = []
+    for dirpath, dirnames, filenames in os.walk(live_dir):
+        rel_dir = os.path.relpath(dirpath, live_dir)
+        target_dir = staging if rel_dir == "." else os.path.join(staging, rel_dir)
+        os.makedirs(target_dir, exist_ok=True)
+        for name in dirnames + filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.islink(path):
+                # Symlinked mod folders are recreated, never walked into
+                try:
+                    os.symlink(os.readlink(path), os.path.join(target_dir, name), target_is_directory=os.path.isdir(path))
+                except OSError as e:
+                    print(f"Could not stage symlink {path}: {e}")
+            elif name in filenames:
+                pending.append((path, os.path.join(target_dir, name)))
+        dirnames[:] = [name for name in dirnames if not os.path.islink(os.path.join(dirpath, name))]
+    with ThreadPoolExecutor(max_workers=max(1, int(jobs))) as executor:
+        list(executor.map(lambda item: materializer.place(*item), pending))
+
+def recover_interrupted_swap(mods_dir):
+    """Finish a swap that was interrupted between moving the old install away and moving the new one in."""
+    staging = mods_dir + STAGING_SUFFIX
+    marker = os.path.join(staging, STAGED_COMPLETE_MARKER)
+    if not os.path.exists(marker):
+        return
+    if not os.path.lexists(mods_dir):
+        print(f"Completing interrupted install swap into {mods_dir}")
+        os.rename(staging, mods_dir)
+        os.remove(os.path.join(mods_dir, STAGED_COMPLETE_MARKER))
+    else:
+        os.remove(marker)  # The swap never started; the staging folder is reused as is
 
-    def capture_stdout(self):
-        output = self.process.readAllStandardOutput().data().decode('utf-8').strip()
-        print(f"Standard Output: {output}")
+def pack_tree_path(mods_dir, pack):
+    """Where the install of a modpack is parked while another one is live."""
+    return f"{mods_dir}{PACK_TREE_SEPARATOR}{pack}"
 
-    def capture_stderr(self):
-        error_msg = self.process.readAllStandardError().data().decode('utf-8').strip()
-        print(f"Standard Error: {error_msg}")
+def installed_pack(mods_dir):
+    """The modpack folder an install's manifest records, or None for installs made before it was recorded."""
+    return load_install_manifest(mods_dir)["pack"]
 
-def update_submodules(repo):
+def pack_trees(mods_dir):
     """
-    Update submodules of a given repository, handling additions and removals.
-
-    Args:
-        repo (Repo): The GitPython Repo object representing the repository.
+    Parked installs next to the Mods folder.
+    Returns:
+        dict: {modpack folder: path}
     """
+    parent, name = os.path.split(mods_dir)
+    prefix = name + PACK_TREE_SEPARATOR
     try:
-        print("Synchronizing submodules...")
-        repo.git.submodule('sync')  # Sync submodule URLs
+        entries = [entry for entry in os.listdir(parent) if entry.startswith(prefix) and TOMBSTONE_INFIX not in entry]
+    except OSError:
+        return {}
+    return {entry[len(prefix):]: os.path.join(parent, entry) for entry in sorted(entries)
+            if os.path.isdir(os.path.join(parent, entry))}
 
-        print("Initializing new submodules...")
-        repo.git.submodule('init')  # Initialize new submodules
+def retire_live_install(mods_dir, pack=None, previous_path=None):
+    """
+    Move the live Mods folder aside for another install. An install of a different modpack than `pack` is parked
+    for switching back, and copied to `previous_path` when a backup was asked for; anything else is kept
+    at `previous_path`, or as a new rollback generation.
+    Returns:
+        str: Where the install now lives, or None if there was none.
+    """
+    if not os.path.lexists(mods_dir):
+        return None
+    live_pack = installed_pack(mods_dir)
+    if live_pack and live_pack != pack and not os.path.lexists(pack_tree_path(mods_dir, live_pack)):
+        previous = pack_tree_path(mods_dir, live_pack)
+        if previous_path:
+            # The parked install changes as soon as it is switched back to, so the backup is a copy of its own
+            try:
+                shutil.copytree(mods_dir, previous_path, symlinks=True)
+            except OSError:
+                shutil.rmtree(previous_path, ignore_errors=True)
+                raise
+    else:
+        previous = previous_path or new_generation_path(mods_dir)
+    os.rename(mods_dir, previous)
+    return previous
 
-        print("Updating submodules recursively...")
-        repo.git.submodule('update', '--recursive', '--remote')  # Update submodules
+def switch_pack_tree(mods_dir, pack):
+    """
+    Make a parked install live with two renames, parking the live one in turn.
+    Returns:
+        str: Where the replaced install now lives, or None if there was none.
+    Raises:
+        FileNotFoundError: If no install of `pack` is parked.
+    """
+    recover_interrupted_swap(mods_dir)
+    tree = pack_tree_path(mods_dir, pack)
+    if not os.path.isdir(tree):
+        raise FileNotFoundError(f"No installed copy of {pack} is kept")
+    previous = retire_live_install(mods_dir, pack)
+    os.rename(tree, mods_dir)
+    return previous
+
+def swap_in_staging(mods_dir, previous_path=None):
+    """
+    Replace the live Mods folder with the staging folder using two renames.
+    The replaced install is parked if it is of another modpack, else kept at `previous_path` or as a new generation.
+    Returns:
+        str: Where the replaced install now lives, or None if there was none.
+    """
+    staging = mods_dir + STAGING_SUFFIX
+    open(os.path.join(staging, STAGED_COMPLETE_MARKER), "w").close()  # Lets recover_interrupted_swap finish the job
+    previous = retire_live_install(mods_dir, installed_pack(staging), previous_path)
+    os.rename(staging, mods_dir)
+    os.remove(os.path.join(mods_dir, STAGED_COMPLETE_MARKER))
+    return previous
+
+def staging_base(mods_dir, pack):
+    """
+    The install a staged install of `pack` starts from, so only its differences have to be written.
+    Returns:
+        tuple: (kind, path) with kind "staging" for an unfinished staged install of the same pack, "live" for the
+            Mods folder when it is of the same pack (or of an unrecorded one), "tree" for the pack's parked install,
+            or (None, None) to start empty.
+    """
+    staging = mods_dir + STAGING_SUFFIX
+    if os.path.isdir(staging) and installed_pack(staging) == pack:
+        return "staging", staging
+    if os.path.isdir(mods_dir) and (pack is None or installed_pack(mods_dir) in (pack, None)):
+        return "live", mods_dir
+    if pack and os.path.isdir(pack_tree_path(mods_dir, pack)):
+        return "tree", pack_tree_path(mods_dir, pack)
+    return None, None
+
+def plan_staged_install(mods_src, mods_dir, mods, mirror=False, mode=DEFAULT_INSTALL_MODE, ignore=None, pack=None,
+                        on_progress=None, should_cancel=None):
+    """
+    Plan a staged install with plan_mod_install, against the install staged_install will build on (see staging_base).
+    Also sets "base" to the staging_base kind, "parks" to the pack whose live install will be parked, and, when the
+    install does not build on the live Mods folder, "carry" to its entries no modpack installed (the user's own mods,
+    lovely) that are hard linked into the new install; a mirror install lists them in "left_behind" instead.
+    """
+    recover_interrupted_swap(mods_dir)  # Finishes a swap a crash interrupted, so the bases below are settled
+    base, target = staging_base(mods_dir, pack)
+    if target is None:
+        target = mods_dir + STAGING_SUFFIX + ".empty"  # Nothing to build on: plan against a folder that does not exist
+    plan = plan_mod_install(mods_src, target, mods, mirror=mirror, mode=mode, ignore=ignore, pack=pack,
+                            on_progress=on_progress, should_cancel=should_cancel)
+    plan["base"] = base
+    live_pack = installed_pack(mods_dir) if os.path.isdir(mods_dir) else None
+    plan["parks"] = live_pack if live_pack and live_pack != pack and not os.path.lexists(pack_tree_path(mods_dir, live_pack)) else None
+    foreign = []
+    if base != "live" and os.path.isdir(mods_dir):
+        foreign = [name for name in foreign_entries(mods_dir)
+                   if name not in plan["mods"] and not os.path.lexists(os.path.join(target, name))]
+    plan["carry"], plan["left_behind"] = ([], foreign) if mirror else (foreign, [])
+    return plan
+
+def foreign_entries(mods_dir):
+    """Top-level entries of an install that its manifest does not record, such as the user's own mods."""
+    manifest = load_install_manifest(mods_dir)
+    recorded = {rel_path.split("/", 1)[0] for rel_path in manifest["files"]} | set(manifest["links"])
+    recorded |= {INSTALL_MANIFEST_NAME, STAGED_COMPLETE_MARKER, STAGED_PARKED_MARKER}
+    try:
+        return sorted(name for name in os.listdir(mods_dir) if name not in recorded)
+    except OSError:
+        return []
 
-        submodules_path = os.path.join(repo.working_tree_dir, '.gitmodules')
-        if not os.path.exists(submodules_path):
-            print(".gitmodules file not found. Skipping stale submodule cleanup.")
-            return
+def carry_foreign_entries(mods_dir, staging, names, jobs=DEFAULT_INSTALL_JOBS):
+    """Hard link top-level entries of the live install into the staging folder (see seed_staging_tree)."""
+    for name in names:
+        source, destination = os.path.join(mods_dir, name), os.path.join(staging, name)
+        if os.path.lexists(destination) or not os.path.lexists(source):
+            continue
+        if os.path.islink(source):
+            os.symlink(os.readlink(source), destination, target_is_directory=os.path.isdir(source))
+        elif os.path.isdir(source):
+            seed_staging_tree(source, destination, jobs)
+        else:
+            FileMaterializer("hardlink").place(source, destination)
 
-        print("Cleaning up stale submodules...")
-        # Deinit stale submodules
-        repo.git.submodule('deinit', '--all', '--force')
+def install_space_needed(plan):
+    """Bytes an install will write: placed files, unless they are links (staging is seeded with hard links too)."""
+    return 0 if plan["mode"] in ("hardlink", "symlink") else plan["bytes"]
 
-        # Remove cached and stale submodules
-        repo.git.rm('--cached', '-r', '--ignore-unmatch', submodules_path)
-        stale_paths = [
-            os.path.join(repo.working_tree_dir, submodule.path) for submodule in repo.submodules
-        ]
-        for path in stale_paths:
-            if os.path.exists(path):
-                shutil.rmtree(path, ignore_errors=True)
+def free_disk_space(path):
+    """Free bytes on the drive that holds `path`, or None if it cannot be queried."""
+    try:
+        return shutil.disk_usage(existing_ancestor(path)).free
+    except OSError:
+        return None
 
-        print("Re-initializing submodules...")
-        repo.git.submodule('init')
-        repo.git.submodule('update', '--recursive', '--remote')
+def load_install_stats():
+    """
+    Read INSTALL_STATS_FILE.
+    Returns:
+        dict: {"throughput": {mode: [bytes per second, files per second]}, "mods": {mod: [bytes, files]}}
+    """
+    try:
+        with open(INSTALL_STATS_FILE, "r") as f:
+            stats = json.load(f)
+        return {"throughput": dict(stats.get("throughput", {})), "mods": dict(stats.get("mods", {}))}
+    except (OSError, ValueError, AttributeError, TypeError):
+        return {"throughput": {}, "mods": {}}
 
-        print("Submodules updated successfully.")
-    except GitCommandError as e:
-        print(f"Git command error: {e}")
-        raise
-    except Exception as e:
-        print(f"Unexpected error during submodule update: {e}")
-        raise
+def save_install_stats(stats):
+    try:
+        with open(INSTALL_STATS_FILE + ".tmp", "w") as f:
+            json.dump(stats, f)
+        os.replace(INSTALL_STATS_FILE + ".tmp", INSTALL_STATS_FILE)
+    except OSError as e:
+        print(f"Could not save install statistics: {e}")
 
-class ModpackUpdateWorker(QThread):
-    finished = pyqtSignal(bool, str)  # Signal to indicate task completion with success status and message
-    progress = pyqtSignal(str)       # Signal to report progress to the GUI
+def record_install_stats(plan, report=None):
+    """
+    Remember the mod sizes a plan measured, and the throughput an install of it reached.
+    Throughput is averaged with earlier installs in the same mode, and only taken from installs
+    that placed enough files for the timing to mean something.
+    """
+    stats = load_install_stats()
+    stats["mods"].update(plan["mod_sizes"])
+    if report and report["copied"] >= 50 and report["seconds"] > 0:
+        measured = [report["bytes"] / report["seconds"], report["copied"] / report["seconds"]]
+        previous = stats["throughput"].get(report["mode"])
+        stats["throughput"][report["mode"]] = [(old + new) / 2 for old, new in zip(previous, measured)] if previous else measured
+    save_install_stats(stats)
+
+def estimate_install_seconds(plan, stats=None):
+    """Time placing a plan's files should take, from the throughput measured by earlier installs."""
+    stats = stats or load_install_stats()
+    bytes_per_second, files_per_second = stats["throughput"].get(plan["mode"], DEFAULT_INSTALL_THROUGHPUT[plan["mode"]])
+    return max(plan["bytes"] / max(bytes_per_second, 1), len(plan["place"]) / max(files_per_second, 1))
+
+def format_install_plan(plan, free_space, seconds):
+    """Dry-run summary of a plan from plan_mod_install, shown before it is executed."""
+    added = sum(1 for item in plan["place"] if item[3])
+    deleted = len(plan["delete"]) + len(plan["delete_top"])
+    lines = []
+    if plan.get("base") == "tree":
+        lines.append(f"Switching to the installed copy of {plan['pack']} kept from before.")
+    if plan.get("parks"):
+        lines.append(f"The current install of {plan['parks']} is kept for switching back.")
+    for key, text in (("carry", "are kept in the Mods folder"), ("left_behind", "are removed from the Mods folder")):
+        if plan.get(key):
+            names = ", ".join(plan[key][:5]) + (f" and {len(plan[key]) - 5} more" if len(plan[key]) > 5 else "")
+            lines.append(f"{len(plan[key])} item(s) that are not part of a modpack {text}: {names}")
+    lines += [f"{len(plan['mods'])} mod(s) will be installed ({INSTALL_MODES[plan['mode']]}):",
+             f"  {added} file(s) to add, {len(plan['place']) - added} to update, {deleted} to delete, {plan['unchanged']} unchanged"]
+    if plan["link"]:
+        lines.append(f"  {len(plan['link'])} mod folder(s) to link")
+    duration = f"about {seconds:.0f} s" if seconds >= 1 else "under a second"
+    lines.append(f"  {format_bytes(plan['bytes'])} to install, {duration}")
+    if free_space is not None:
+        lines.append(f"  {format_bytes(free_space)} free on the Mods drive, {format_bytes(install_space_needed(plan))} needed")
+    if plan["failed"]:
+        lines.append(f"\n{len(plan['failed'])} mod(s) could not be checked and will be skipped:\n{format_install_errors(plan['failed'])}")
+    return "\n".join(lines)
+
+def format_install_plan_details(plan, limit=PLAN_DETAILS_LIMIT):
+    """Every change of a plan, one per line: '+' adds, '~' updates, '-' deletes."""
+    lines = [f"+ {mod}/ (symlink)" for mod, _, _ in plan["link"]]
+    lines += [f"{'+' if is_new else '~'} {rel_path}" for _, rel_path, _, is_new in plan["place"]]
+    lines += [f"- {rel_path}" for _, rel_path in plan["delete"]]
+    lines += [f"- {name}" for name in plan["delete_top"]]
+    if len(lines) > limit:
+        lines = lines[:limit] + [f"...and {len(lines) - limit} more"]
+    return "\n".join(lines)
+
+def staged_install(plan, mods_dir, jobs=DEFAULT_INSTALL_JOBS, generations=DEFAULT_INSTALL_GENERATIONS, previous_path=None,
+                   on_progress=None, should_cancel=None):
+    """
+    Execute a plan from plan_staged_install in <mods_dir>.staging, then swap it in. The replaced install is parked
+    if it is of another modpack, else kept as a rollback generation (or at `previous_path`, which is never pruned).
+    The staging folder starts as the install the plan was made against: a parked install of the same modpack is
+    renamed into place, the live one is seeded with hard links.
+    The live Mods folder is not touched until the swap, so a crash or cancel leaves it intact;
+    an unfinished staging folder is picked up again by the next install.
+    Returns:
+        dict: The execute_install_plan report, plus "previous": where the replaced install was kept.
+    Raises:
+        OSError: With ENOSPC before anything is written, if the Mods drive cannot hold what the plan writes.
+        RuntimeError: If the installs changed since the plan was made.
+    """
+    free_space = free_disk_space(mods_dir)
+    needed = install_space_needed(plan)
+    if free_space is not None and needed and free_space < needed + FREE_SPACE_MARGIN:
+        raise OSError(errno.ENOSPC, f"Not enough disk space: {format_bytes(needed)} needed, {format_bytes(free_space)} free", mods_dir)
+
+    recover_interrupted_swap(mods_dir)
+    base, target = staging_base(mods_dir, plan["pack"])
+    if base != plan["base"]:
+        raise RuntimeError("The Mods folder changed since the install was checked; install again.")
+    staging = mods_dir + STAGING_SUFFIX
+    if base != "staging" and os.path.lexists(staging):
+        # An unfinished install of another modpack: park it again if it is a parked install no plan was applied to,
+        # anything else is a half-written install
+        parked = os.path.exists(os.path.join(staging, STAGED_PARKED_MARKER))
+        staging_pack = installed_pack(staging)
+        if parked and staging_pack and staging_pack != installed_pack(mods_dir) and not os.path.lexists(pack_tree_path(mods_dir, staging_pack)):
+            os.remove(os.path.join(staging, STAGED_PARKED_MARKER))
+            os.rename(staging, pack_tree_path(mods_dir, staging_pack))
+        else:
+            tombstone_folder(staging)
+    if base == "tree":
+        os.rename(target, staging)
+        open(os.path.join(staging, STAGED_PARKED_MARKER), "w").close()
+    elif base == "live":
+        if on_progress:
+            on_progress({"stage": "preparing", "mod": "", "index": 0, "total": 0,
+                         "files_done": 0, "files_total": 0, "bytes_done": 0, "bytes_total": 0})
+        seeding = staging + ".seeding"
+        shutil.rmtree(seeding, ignore_errors=True)
+        seed_staging_tree(mods_dir, seeding, jobs)
+        os.rename(seeding, staging)
+    elif base is None:
+        os.makedirs(staging)
+
+    parked_marker = os.path.join(staging, STAGED_PARKED_MARKER)
+    if os.path.exists(parked_marker):
+        os.remove(parked_marker)  # From here on the staging folder is no longer the parked install
+    carry_foreign_entries(mods_dir, staging, plan.get("carry", []), jobs)
+    report = execute_install_plan(plan, staging, jobs=jobs, on_progress=on_progress, should_cancel=should_cancel)
+    report["previous"] = None
+    if report["cancelled"]:
+        return report
+
+    report["previous"] = swap_in_staging(mods_dir, previous_path)
+    prune_install_generations(mods_dir, generations)
+    return report
+
+def rollback_install(mods_dir):
+    """
+    Swap the newest kept generation back in with two renames. The current install becomes
+    the newest generation, so rolling back again undoes the rollback.
+    Returns:
+        str: The generation that was restored, or None if there is none.
+    """
+    recover_interrupted_swap(mods_dir)
+    generations = install_generations(mods_dir)
+    if not generations:
+        return None
+    if os.path.lexists(mods_dir):
+        os.rename(mods_dir, new_generation_path(mods_dir))
+    os.rename(generations[0], mods_dir)
+    return generations[0]
+
+def format_install_report(report):
+    """One-line summary of an execute_install_plan report."""
+    text = f"{report['copied']} file(s) installed ({format_bytes(report['bytes'])}), "
+    if report["linked"]:
+        text += f"{report['linked']} mod folder(s) linked, "
+    return text + f"{report['deleted']} removed, {report['unchanged']} unchanged"
+
+def format_install_errors(failed, limit=10):
+    """Group install errors by mod into one readable block, listing at most `limit` mods."""
+    by_mod = {}
+    for mod, error in failed:
+        by_mod.setdefault(mod, []).append(error)
+    lines = [f"{mod}: {errors[0]}" + (f" (and {len(errors) - 1} more)" if len(errors) > 1 else "")
+             for mod, errors in list(by_mod.items())[:limit]]
+    if len(by_mod) > limit:
+        lines.append(f"...and {len(by_mod) - limit} more mod(s)")
+    return "\n".join(lines)
+
+def format_install_progress(event):
+    """Percent and label text for the install progress dialog, from a planning or install progress event."""
+    if event["stage"] == "preparing":
+        return 0, "Preparing staged install..."
+    if event["stage"] == "scanning":
+        percent = int(event["index"] / event["total"] * 100) if event["total"] else 0
+        return percent, f"Checking mod: {event['mod']} ({event['index']}/{event['total']})"
+    percent = int(event["bytes_done"] / event["bytes_total"] * 100) if event["bytes_total"] else 100
+    return percent, (f"Installing mod: {event['mod']}\n{format_bytes(event['bytes_done'])} of {format_bytes(event['bytes_total'])} "
+                     f"({event['files_done']}/{event['files_total']} files)")
+
+class ModInstallPlanWorker(QThread):
+    finished = pyqtSignal(bool, str)
+    progress = pyqtSignal(dict)  # {"percent", "text"} for the progress dialog
 
-    def __init__(self, repo_url, repo_name, branch_name, parent_folder):
+    def __init__(self, mods_src, mods_dir, mods, mirror=False, install_mode=DEFAULT_INSTALL_MODE, ignore=None, pack=None):
         super().__init__()
-        self.repo_url = repo_url
-        self.repo_name = repo_name
-        self.branch_name = branch_name
-        self.repo_path = os.path.join(parent_folder, self.repo_name)
+        self.mods_src = mods_src
+        self.mods_dir = mods_dir
+        self.mods = list(mods)
+        self.mirror = mirror  # Delete everything in the Mods folder that is not being installed
+        self.install_mode = install_mode
+        self.ignore = ignore  # load_ignore_table result
+        self.pack = pack  # Modpack folder name, to park and switch back to its install
+        self.cancelled = False
+        self.plan = None  # plan_staged_install result once finished
+
+    def cancel(self):
+        self.cancelled = True
 
     def run(self):
+        start = time.perf_counter()
         try:
-            if not os.path.exists(self.repo_path) or not os.path.isdir(self.repo_path):
-                self.finished.emit(False, f"Invalid repository path: {self.repo_path}")
-                return
-
-            repo = Repo(self.repo_path)
+            self.plan = plan_staged_install(self.mods_src, self.mods_dir, self.mods, mirror=self.mirror, mode=self.install_mode,
+                                            ignore=self.ignore, pack=self.pack, on_progress=self.on_progress,
+                                            should_cancel=lambda: self.cancelled)
+        except Exception as e:
+            self.finished.emit(False, f"An error occurred while checking the mods to install: {e}")
+            return
+        if self.plan["cancelled"]:
+            self.finished.emit(False, "The installation process was canceled. Your Mods folder was not changed.")
+            return
+        record_install_stats(self.plan)
+        print(f"Install plan ({self.plan['mode']}): {len(self.plan['place'])} file(s) to place, "
+              f"{len(self.plan['delete']) + len(self.plan['delete_top'])} to delete in {time.perf_counter() - start:.2f} s")
+        self.finished.emit(True, "")
 
-            # Handle uncommitted changes
-            try:
-                if repo.is_dirty(untracked_files=True):
-                    self.progress.emit("Uncommitted changes detected. Resetting and cleaning repository...")
-                    repo.git.reset('--hard')  # Discard local changes
-                    repo.git.clean('-fd')     # Remove untracked files and directories
-            except GitCommandError as e:
-                self.finished.emit(False, f"Error resetting repository: {str(e)}")
-                return
+    def on_progress(self, event):
+        percent, text = format_install_progress(event)
+        self.progress.emit({"percent": percent, "text": text})
 
-            # Pull the latest changes
-            self.progress.emit("Pulling latest changes...")
-            try:
-                repo.remotes.origin.pull()
-            except GitCommandError as e:
-                self.finished.emit(False, f"Error pulling latest changes: {str(e)}")
-                return
+class ModInstallWorker(QThread):
+    finished = pyqtSignal(bool, str)
+    progress = pyqtSignal(dict)  # {"percent", "text"} for the progress dialog
 
-            # Update submodules
-            self.progress.emit("Updating submodules...")
-            try:
-                self.update_submodules(repo)
-            except GitCommandError as e:
-                self.finished.emit(False, f"Error updating submodules: {str(e)}")
-                return
+    def __init__(self, plan, mods_dir, jobs=DEFAULT_INSTALL_JOBS, generations=DEFAULT_INSTALL_GENERATIONS, backup_path=None):
+        super().__init__()
+        self.plan = plan  # From ModInstallPlanWorker; executed as is
+        self.mods_dir = mods_dir
+        self.jobs = jobs
+        self.generations = generations  # Previous installs kept for rollback
+        self.backup_path = backup_path  # Keep the replaced install here instead of as a generation
+        self.cancelled = False
+        self.report = None  # execute_install_plan report once finished
+        self.last_emit = 0.0
+
+    def cancel(self):
+        """Request cancellation; files already being placed finish, nothing new starts."""
+        self.cancelled = True
 
-            self.finished.emit(True, "Modpack and submodules updated successfully.")
-        except GitCommandError as e:
-            self.finished.emit(False, f"Git error: {str(e)}")
+    def run(self):
+        start = time.perf_counter()
+        try:
+            self.report = staged_install(self.plan, self.mods_dir, jobs=self.jobs, generations=self.generations,
+                                         previous_path=self.backup_path, on_progress=self.on_progress,
+                                         should_cancel=lambda: self.cancelled)
         except Exception as e:
-            self.finished.emit(False, f"Unexpected error: {str(e)}")
+            self.finished.emit(False, f"An error occurred during installation: {e}")
+            return
+
+        report = self.report
+        record_install_stats(self.plan, report)
+        print(f"Install ({report['mode']}): {format_install_report(report)} in {time.perf_counter() - start:.2f} s")
+        summary = f"{format_install_report(report)}."
+        if self.backup_path and os.path.isdir(self.backup_path):
+            summary += f"\n\nMods folder successfully backed up to:\n{self.backup_path}"
+        if report["cancelled"]:
+            self.finished.emit(False, "The installation process was canceled. Your Mods folder was not changed; install again to finish.")
+        elif report["failed"]:
+            self.finished.emit(False, f"Installed modpack, but {len(report['failed'])} error(s) occurred:\n\n"
+                                      f"{format_install_errors(report['failed'])}\n\n{summary}")
+        else:
+            self.finished.emit(True, f"Successfully installed modpack.\n{summary}")
 
-    def update_submodules(self, repo):
-        """Update all submodules recursively."""
-        repo.git.submodule('update', '--init', '--recursive')
-        self.progress.emit("Submodules updated.")
+    def on_progress(self, event):
+        # Called from the copy threads; throttle to keep the signal queue short
+        now = time.perf_counter()
+        final = event["stage"] != "installing" or event["files_done"] == event["files_total"]
+        if not final and now - self.last_emit < 0.1:
+            return
+        self.last_emit = now
+        percent, text = format_install_progress(event)
+        self.progress.emit({"percent": percent, "text": text})
 
 ############################################################
 # Tutorial class
@@ -621,14 +3381,12 @@ class TutorialPopup(QDialog):
 
 class ModpackManagerApp(QWidget):  # or QMainWindow
     
+    @profiler.profiled("ModpackManagerApp.__init__")
     def __init__(self, *args, **kwargs):
         super(ModpackManagerApp, self).__init__(*args, **kwargs)
         self.setWindowTitle("Dimserene's Modpack Manager")
 
-        if not os.path.exists(LOGO_PATH):
-            download_logo(LOGO_URL, LOGO_PATH)
-
-        # Load the splash screen
+        # Load the splash screen (the logo is downloaded by the bootstrap if missing)
         splash_pixmap = QPixmap(LOGO_PATH).scaled(
             400, 400, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
         )
@@ -638,21 +3396,22 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
             Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter,
             Qt.GlobalColor.black,
         )
-        self.splash.show()
+        if not splash_pixmap.isNull():
+            self.splash.show()
 
         # Flags to track whether the popups are open
         self.settings_popup_open = False
         self.revert_popup_open = False
         self.install_popup_open = False
 
-        # Initialize metadata as an attribute
+        # Initialize metadata and its genre/tag indexes as attributes
         self.metadata = {}
+        self.mod_genres = []
+        self.mod_tags = []
 
-        # Fetch modpack data with offline support
-        self.modpack_data = fetch_modpack_data("https://raw.githubusercontent.com/Dimserene/ModpackManager/main/information.json")
-        if not self.modpack_data:
-            QMessageBox.critical(self, "Error", "Failed to load modpack data. Please check your internet connection.")
-            self.modpack_data = {"modpack_categories": []}  # Use empty data as a fallback
+        # Draw the window from cached modpack data; fresh data arrives from the bootstrap worker
+        self.modpack_data = load_cached_modpack_data() or {"modpack_categories": []}
+        self.dependencies = self.modpack_data.get("dependencies", {})
 
         self.branch_data = {}        # Dictionary to store branches for each modpack
 
@@ -660,12 +3419,10 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         self.favorite_mods = set()  # Initialize favorites
         self.load_favorites()  # Load favorites on startup
 
-        # Load and process the CSV data
-        data = fetch_csv_data(sheet_url)  # Replace with your CSV-fetching logic
-        if data is not None:
-            self.metadata = map_mods_to_metadata(data)  # Create metadata mapping
-        else:
-            QMessageBox.critical(self, "Error", "Failed to load metadata. Ensure the CSV is accessible.")
+        # Load the metadata index for the cached CSV data
+        index = load_cached_csv_data()
+        if index is not None:
+            self.apply_metadata_index(index)
 
         # Load settings (either default or user preferences)
         self.settings = self.load_settings()
@@ -685,24 +3442,28 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         self.old_version = ""
         self.version_hash = ""
 
-        # Fetch modpack data
-        self.modpack_data = modpack_data  # Assign the global modpack_data to an instance variable
-
-        # Proceed only if data is available
-        if not self.modpack_data:
-            QMessageBox.critical(self, "Error", "Failed to load modpack data. Please check your internet connection.")
-            return
-
         self.splash.finish(self)
 
         self.create_widgets()
+
+        # Delete tombstoned folders in the background, including ones an earlier session did not finish
+        self.deletion_worker = FolderDeletionWorker()
+        self.deletion_worker.progress.connect(self.show_deletion_progress)
+        self.deletion_worker.deleted.connect(self.on_folder_deleted)
+        self.deletion_worker.finished.connect(self.deletion_progress.hide)
+        self.resume_pending_deletions()
         
         self.initialize_branches()   # List all branches on startup
         self.update_branch_dropdown()
         self.update_installed_info()  # Initial update
-        self.check_for_updates()
+
+        # Fetch remote data once, concurrently and off the GUI thread
+        self.bootstrap_worker = BootstrapWorker()
+        self.bootstrap_worker.finished.connect(self.on_bootstrap_finished)
+        self.bootstrap_worker.start()
 
         # Backup interval in seconds (user set, example: 300 seconds -> 5 minutes)
+        self.submodule_states = {}  # Path -> latest SubmoduleFetcher event of the running download or update
         self.backup_interval = 60  # Default backup interval
         self.backup_timer = QTimer()
         self.backup_timer.timeout.connect(self.perform_backup)
@@ -725,17 +3486,69 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
             ("That's it! You are now ready to use the Modpack Manager.", self)
         ]
     
+    def on_bootstrap_finished(self, result):
+        """Apply the remote data fetched by the bootstrap worker."""
+        log_http_stats("startup")
+        # Only touch the widgets when the fresh data differs from what is displayed
+        modpack_data = result.get("modpack_data")
+        if modpack_data and modpack_data != self.modpack_data:
+            self.modpack_data = modpack_data
+            self.dependencies = self.modpack_data.get("dependencies", {})
+            self.refresh_modpack_widgets()
+
+        index = result.get("metadata_index")
+        if index is not None and index["metadata"] != self.metadata:
+            changed = sum(1 for mod, info in index["metadata"].items() if self.metadata.get(mod) != info)
+            print(f"Metadata refreshed: {changed} mod(s) changed.")
+            self.apply_metadata_index(index)
+
+        if not self.modpack_data.get("modpack_categories"):
+            profiler.write_report()
+            QMessageBox.critical(self, "Error", "Failed to load modpack data. Please check your internet connection.")
+            return
+        if not self.metadata:
+            QMessageBox.critical(self, "Error", "Failed to load metadata. Ensure the CSV is accessible.")
+
+        self.check_for_updates()
+        profiler.write_report()
+
+    def apply_metadata_index(self, index):
+        """Use a compiled metadata index for the mod metadata and the genre/tag filters."""
+        self.metadata = map_mods_to_metadata(index)
+        self.mod_genres = index["genres"]
+        self.mod_tags = index["tags"]
+
     def closeEvent(self, event):
+        # An update cannot be cancelled, and stopping it could leave the checkout half-pulled
+        if isinstance(self.worker, ModpackUpdateWorker) and self.worker.isRunning():
+            QMessageBox.information(self, "Update in Progress", "Please wait for the modpack update to finish before closing.")
+            event.ignore()
+            return
+
+        # Stop the other workers and let them finish before the window is destroyed; a cancelled install
+        # never starts its swap, and a cancelled deletion resumes on the next launch
+        workers = [self.worker, getattr(self, "install_plan_worker", None), getattr(self, "install_worker", None),
+                   self.deletion_worker]
+        for worker in workers:
+            if worker is not None and worker.isRunning():
+                worker.blockSignals(True)  # No result dialogs while closing
+                worker.cancel()
+        for worker in workers + [self.bootstrap_worker]:
+            if worker is not None and worker.isRunning():
+                worker.wait()
+
         # Save the selected modpack when the window is closed
         selected_modpack = self.modpack_var.currentText()
         self.settings["default_modpack"] = selected_modpack
 
         # Save settings without showing a popup
         self.save_settings(default_modpack=selected_modpack)
+        log_http_stats("session")
 
         # Call the default closeEvent to continue closing the window
         super(ModpackManagerApp, self).closeEvent(event)
 
+    @profiler.profiled()
     def check_for_updates(self):
         """
         Check if an update is available for the manager.
@@ -792,6 +3605,7 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
                     modpack_names.append(modpack['name'])
         return modpack_names
 
+    @profiler.profiled()
     def create_widgets(self):
         layout = QGridLayout()
 
@@ -898,7 +3712,9 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         self.install_button.setStyleSheet("font: 12pt 'Helvetica';")
         layout.addWidget(self.install_button, 7, 0, 1, 3)
         self.install_button.clicked.connect(self.install_modpack)
-        self.install_button.setToolTip("Copy (install) Mods content")
+        self.install_button.setToolTip("Copy (install) Mods content\nRight-click to roll back to the previous install")
+        self.install_button.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.install_button.customContextMenuRequested.connect(self.show_install_menu)
 
         # Uninstall button
         self.uninstall_button = QPushButton("Uninstall (Remove)", self)
@@ -980,6 +3796,22 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         """)
         layout.addWidget(self.tutorial_link, 11, 0, 1, 2)
 
+        self.info = QLabel(f"Build: {DATE}, Iteration: {ITERATION}, Version: Release {VERSION}", self)
+        self.update_version_label()
+        layout.addWidget(self.info, 11, 0, 1, 6, alignment=Qt.AlignmentFlag.AlignRight)
+
+        # Progress of folders being deleted in the background, hidden while there are none
+        self.deletion_progress = QProgressBar(self)
+        self.deletion_progress.setFormat("Deleting old files... %p%")
+        self.deletion_progress.setStyleSheet("font: 10pt 'Helvetica';")
+        self.deletion_progress.hide()
+        layout.addWidget(self.deletion_progress, 12, 0, 1, 6)
+
+        # Apply the grid layout to the window
+        self.setLayout(layout)
+
+    def update_version_label(self):
+        """Color the build info label by comparing the local and latest versions."""
         latest_version_str = self.modpack_data.get("latest_version", None)
 
         # Validate and compare versions
@@ -995,12 +3827,44 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         else:
             version_style = "color: gray;"  # No version fetched
 
-        self.info = QLabel(f"Build: {DATE}, Iteration: {ITERATION}, Version: Release {VERSION}", self)
         self.info.setStyleSheet(f"font: 8pt 'Helvetica'; {version_style}")
-        layout.addWidget(self.info, 11, 0, 1, 6, alignment=Qt.AlignmentFlag.AlignRight)
 
-        # Apply the grid layout to the window
-        self.setLayout(layout)
+    @profiler.profiled()
+    def refresh_modpack_widgets(self):
+        """Update the modpack and branch dropdowns in place after the modpack data changed."""
+        selected_modpack = self.modpack_var.currentText()
+        modpacks_changed = sync_combo_items(self.modpack_var, self.get_modpack_names())
+
+        old_branch_data = self.branch_data
+        self.initialize_branches()
+        changed_branches = {
+            name for name in set(old_branch_data) | set(self.branch_data)
+            if old_branch_data.get(name) != self.branch_data.get(name)
+        }
+
+        current_modpack = self.modpack_var.currentText()
+        if current_modpack != selected_modpack:
+            # Nothing was selected yet (no cached data at startup) or the selection was removed upstream:
+            # fall back to the saved default modpack before running the usual change handlers
+            default_modpack = self.settings.get("default_modpack")
+            index = self.modpack_var.findText(default_modpack) if default_modpack else -1
+            if index >= 0:
+                was_blocked = self.modpack_var.blockSignals(True)
+                self.modpack_var.setCurrentIndex(index)
+                self.modpack_var.blockSignals(was_blocked)
+            current_modpack = self.modpack_var.currentText()
+        if current_modpack != selected_modpack:
+            self.update_branch_dropdown()
+            self.on_modpack_changed()
+        elif current_modpack in changed_branches:
+            branches = self.branch_data.get(current_modpack, [])
+            sync_combo_items(self.branch_var, branches)
+            self.branch_var.setVisible(bool(branches))
+
+        self.update_modpack_description()
+        self.update_version_label()
+        print(f"Modpack data refreshed: modpack list {'changed' if modpacks_changed else 'unchanged'}, "
+              f"branches changed for {sorted(changed_branches) or 'none'}.")
 
     # Function to handle modpack change
     def on_modpack_changed(self):
@@ -1039,8 +3903,10 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         """Returns the Git URL for the selected modpack."""
         return self.modpack_data.get(modpack_name, {}).get("url", "")
 
+    @profiler.profiled()
     def initialize_branches(self):
         """Lists all branches for each modpack and stores them."""
+        self.branch_data = {}
         for category in self.modpack_data.get("modpack_categories", []):
             for modpack in category.get("modpacks", []):
                 modpack_name = modpack["name"]
@@ -1071,7 +3937,8 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         else:
             self.branch_var.clear()
             self.branch_var.setVisible(False)
-            QMessageBox.information(self, "Info", f"No branches available for {selected_modpack}.")
+            if selected_modpack:
+                QMessageBox.information(self, "Info", f"No branches available for {selected_modpack}.")
 
 ############################################################
 # Foundation of tutorial
@@ -1208,20 +4075,78 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         # self.auto_install_checkbox.setChecked(self.settings.get("auto_install_after_download", False))
         # layout.addWidget(self.auto_install_checkbox, 10, 0, 1, 2)
 
+        # Clone strategy used for new downloads
+        self.clone_strategy_label = QLabel("Download Mode:", popup)
+        layout.addWidget(self.clone_strategy_label, 11, 0, 1, 2)
+
+        clone_strategy_var = QComboBox(popup)
+        for strategy, (label, _) in CLONE_STRATEGIES.items():
+            clone_strategy_var.addItem(label, strategy)
+        clone_strategy_var.setCurrentIndex(max(0, clone_strategy_var.findData(self.settings.get("clone_strategy", DEFAULT_CLONE_STRATEGY))))
+        clone_strategy_var.setToolTip("Shallow and partial downloads skip the history of the modpack and its mods")
+        layout.addWidget(clone_strategy_var, 12, 0, 1, 2)
+
+        # Number of submodules fetched in parallel
+        self.submodule_jobs_label = QLabel("Parallel Mod Downloads:", popup)
+        layout.addWidget(self.submodule_jobs_label, 13, 0)
+
+        submodule_jobs_spinbox = QSpinBox(popup)
+        submodule_jobs_spinbox.setRange(1, 32)
+        submodule_jobs_spinbox.setValue(self.settings.get("submodule_jobs", DEFAULT_SUBMODULE_JOBS))
+        layout.addWidget(submodule_jobs_spinbox, 13, 1)
+
+        # How mods are placed into the Mods folder
+        self.install_mode_label = QLabel("Install Mode:", popup)
+        layout.addWidget(self.install_mode_label, 14, 0, 1, 2)
+
+        install_mode_var = QComboBox(popup)
+        for mode, label in INSTALL_MODES.items():
+            install_mode_var.addItem(label, mode)
+        install_mode_var.setCurrentIndex(max(0, install_mode_var.findData(self.settings.get("install_mode", DEFAULT_INSTALL_MODE))))
+        install_mode_var.setToolTip("Links and clones make installs near-instant; with links, editing an installed mod also edits the downloaded modpack.\n"
+                                    "With hard links and shared mod files, installed files are read-only; mod config files are copied,\n"
+                                    "but a mod that writes other files into its own folder needs Copy or Clone.\n"
+                                    "Symlinked mods are read-only the same way.\n"
+                                    "Falls back to copying where the filesystem does not support the chosen mode.")
+        layout.addWidget(install_mode_var, 15, 0, 1, 2)
+
+        # Previous installs kept for instant rollback
+        self.install_generations_label = QLabel("Rollback Generations:", popup)
+        layout.addWidget(self.install_generations_label, 16, 0)
+
+        install_generations_spinbox = QSpinBox(popup)
+        install_generations_spinbox.setRange(0, 10)
+        install_generations_spinbox.setValue(self.settings.get("install_generations", DEFAULT_INSTALL_GENERATIONS))
+        install_generations_spinbox.setToolTip("Previous installs kept next to the Mods folder; right-click Install to roll back")
+        layout.addWidget(install_generations_spinbox, 16, 1)
+
+        # Identical mod files of different modpacks stored once
+        deduplicate_checkbox = QCheckBox("Share Identical Mod Files Between Modpacks", popup)
+        deduplicate_checkbox.setChecked(self.settings.get("deduplicate_mods", True))
+        deduplicate_checkbox.setToolTip("After a download or update, files that another modpack already has are hard linked to one stored copy.\n"
+                                        "Stored copies are read-only, which also applies to hard link and symlink installs.")
+        layout.addWidget(deduplicate_checkbox, 17, 0, 1, 2)
+
         # Reset to Default Button
         self.default_button = QPushButton("Reset to Default", popup)
-        self.default_button.clicked.connect(lambda: self.reset_to_default(game_dir_entry, mods_dir_entry, profile_name_var))
-        layout.addWidget(self.default_button, 16, 0, 1, 2)
+        self.default_button.clicked.connect(lambda: self.reset_to_default(
+            game_dir_entry, mods_dir_entry, profile_name_var, clone_strategy_var, submodule_jobs_spinbox,
+            install_mode_var, install_generations_spinbox, deduplicate_checkbox))
+        layout.addWidget(self.default_button, 18, 0, 1, 2)
 
         # Save and Cancel Buttons
         self.save_settings_button = QPushButton("Save", popup)
-        self.save_settings_button.clicked.connect(lambda: self.save_settings(popup, game_dir_entry.text(), mods_dir_entry.text(), profile_name_var.currentText(), self.modpack_var.currentText(), self.backup_interval))
-        layout.addWidget(self.save_settings_button, 17, 0)
+        self.save_settings_button.clicked.connect(lambda: self.save_settings(
+            popup, game_dir_entry.text(), mods_dir_entry.text(), profile_name_var.currentText(),
+            self.modpack_var.currentText(), self.backup_interval, clone_strategy_var.currentData(),
+            submodule_jobs_spinbox.value(), install_mode_var.currentData(), install_generations_spinbox.value(),
+            deduplicate_checkbox.isChecked()))
+        layout.addWidget(self.save_settings_button, 19, 0)
 
         self.cancel_settings_button = QPushButton("Exit", popup)
         self.cancel_settings_button.clicked.connect(lambda: popup.close())
 
-        layout.addWidget(self.cancel_settings_button, 17, 1)
+        layout.addWidget(self.cancel_settings_button, 19, 1)
 
         # Set the fixed width of the popup
         popup.setFixedWidth(400)
@@ -1251,7 +4176,9 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
             return DEFAULT_SETTINGS.copy()
 
     # Function to save settings to the JSON file
-    def save_settings(self, popup=None, game_directory=None, mods_directory=None, profile_name=None, default_modpack=None, backup_interval=None):
+    def save_settings(self, popup=None, game_directory=None, mods_directory=None, profile_name=None, default_modpack=None,
+                      backup_interval=None, clone_strategy=None, submodule_jobs=None, install_mode=None,
+                      install_generations=None, deduplicate_mods=None):
         # Save the settings to the settings dictionary if provided
         if game_directory is not None:
             self.settings["game_directory"] = game_directory
@@ -1263,6 +4190,16 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
             self.settings["default_modpack"] = default_modpack
         if backup_interval is not None:
             self.settings["backup_interval"] = backup_interval
+        if clone_strategy is not None:
+            self.settings["clone_strategy"] = clone_strategy
+        if submodule_jobs is not None:
+            self.settings["submodule_jobs"] = submodule_jobs
+        if install_mode is not None:
+            self.settings["install_mode"] = install_mode
+        if install_generations is not None:
+            self.settings["install_generations"] = install_generations
+        if deduplicate_mods is not None:
+            self.settings["deduplicate_mods"] = deduplicate_mods
 
         # Write the settings to the JSON file
         try:
@@ -1275,7 +4212,9 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
                 popup.close()
 
     # Function to reset settings to defaults
-    def reset_to_default(self, game_dir_entry, mods_dir_entry, profile_name_var):
+    def reset_to_default(self, game_dir_entry, mods_dir_entry, profile_name_var, clone_strategy_var=None,
+                         submodule_jobs_spinbox=None, install_mode_var=None, install_generations_spinbox=None,
+                         deduplicate_checkbox=None):
         self.settings = DEFAULT_SETTINGS.copy()
         
         # Reset game directory
@@ -1291,6 +4230,18 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         # Reset profile name in the combobox
         profile_name_var.setCurrentText(self.settings["profile_name"])
 
+        # Reset clone strategy
+        if clone_strategy_var is not None:
+            clone_strategy_var.setCurrentIndex(clone_strategy_var.findData(self.settings["clone_strategy"]))
+        if submodule_jobs_spinbox is not None:
+            submodule_jobs_spinbox.setValue(self.settings["submodule_jobs"])
+        if install_mode_var is not None:
+            install_mode_var.setCurrentIndex(install_mode_var.findData(self.settings["install_mode"]))
+        if install_generations_spinbox is not None:
+            install_generations_spinbox.setValue(self.settings["install_generations"])
+        if deduplicate_checkbox is not None:
+            deduplicate_checkbox.setChecked(self.settings["deduplicate_mods"])
+
     # Function to browse and update the directory
     def browse_directory(self, entry_widget, readonly):
         folder_selected = QFileDialog.getExistingDirectory(self, "Select Directory")
@@ -1858,7 +4809,7 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
             api_url = f"https://api.github.com/repos/{owner}/{repo}/commits/{branch}"
             
             # Make a GET request to fetch the latest commit details
-            response = requests.get(api_url)
+            response = http_get(api_url)
             response.raise_for_status()  # Raise an HTTPError for bad responses
 
             # Extract commit details from the response
@@ -1931,6 +4882,41 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         
         return current_version, pack_name
 
+    def delete_in_background(self, path):
+        """
+        Move a folder aside instantly and delete it on the deletion worker.
+        Raises:
+            OSError: If the folder cannot be moved, e.g. because the game has files in it open.
+        """
+        self.queue_deletions([tombstone_folder(path)])
+
+    def resume_pending_deletions(self):
+        """Queue the tombstones left by worker threads or by an earlier session."""
+        self.queue_deletions(pending_deletions())
+
+    def queue_deletions(self, tombstones):
+        start = False
+        for tombstone in tombstones:
+            start = self.deletion_worker.add(tombstone) or start
+        if start:
+            self.deletion_worker.wait()  # It may still be returning from its previous run
+            self.deletion_progress.setValue(0)
+            self.deletion_progress.show()
+            self.deletion_worker.start()
+
+    def show_deletion_progress(self, done, total):
+        self.deletion_progress.setMaximum(max(total, 1))
+        self.deletion_progress.setValue(done)
+
+    def on_folder_deleted(self, tombstone, error):
+        if error:
+            QMessageBox.warning(
+                self, "Deletion Failed",
+                f"Could not finish deleting {os.path.basename(tombstone)}:\n{error}\n\n"
+                "Close any program using its files (e.g. the game); the deletion is retried on the next launch."
+            )
+
+    @profiler.profiled()
     def update_installed_info(self):
         """Update the installed modpack information with macOS support."""
         # Load user settings once
@@ -1960,6 +4946,11 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
             if pack_name
             else "No modpack installed or ModpackUtil mod removed."
         )
+
+        # Installs of other modpacks kept for switching, read from the install manifests
+        parked = [pack for pack in pack_trees(install_path) if pack != installed_pack(install_path)]
+        if parked:
+            info_text += f"\nAlso installed (right-click Install to switch): {', '.join(parked)}"
         self.installed_info_label.setText(info_text)
         self.installed_info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
@@ -1986,10 +4977,9 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
     def update_modpack_description(self):
         selected_modpack = self.modpack_var.currentText()
         modpack_info = self.get_modpack_info(selected_modpack)
-        if modpack_info:
-            self.description_label.setText(modpack_info['description'])
-        else:
-            self.description_label.setText("Description not available.")
+        description = modpack_info['description'] if modpack_info else "Description not available."
+        if self.description_label.text() != description:
+            self.description_label.setText(description)
 
 ############################################################
 # Middle functions (Download, install, update, uninstall)
@@ -2037,29 +5027,26 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         repo_path = os.path.join(os.getcwd(), "Modpacks", folder_name)
 
         # Check if the folder already exists
-        if os.path.exists(repo_path):
+        resume = is_download_incomplete(repo_path)
+        if resume:
+            print(f"Resuming interrupted download: {repo_path}")
+        elif os.path.exists(repo_path):
             response = QMessageBox.question(
                 self,
-                "Overwrite Existing Modpack",
-                f"The folder '{folder_name}' already exists. Do you want to overwrite it?",
+                "Repair Existing Modpack",
+                f"The folder '{folder_name}' already exists. Do you want to re-download it?\n\n"
+                "Already downloaded data is reused: the modpack is reset to the latest version and local changes are discarded.",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
             )
             if response == QMessageBox.StandardButton.No:
                 return  # Exit early if the user does not want to overwrite
-
-            # If Yes, delete the existing folder
-            try:
-                shutil.rmtree(repo_path, onerror=readonly_handler)  # Remove the folder and its contents
-                print(f"Deleted existing folder: {repo_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to delete existing folder: {str(e)}")
-                return
+            # If Yes, the worker repairs the folder, and only reclones it if it is corrupt
 
         # Ensure the Modpacks folder exists
         os.makedirs(os.path.dirname(repo_path), exist_ok=True)
 
-        # Create and display the progress dialog for updating
-        self.progress_dialog = QProgressDialog("", None, 0, 0)  # Pass None to remove the cancel button
+        # Create and display the progress dialog for downloading
+        self.progress_dialog = QProgressDialog("", "Cancel", 0, 0)
         self.progress_dialog.setWindowFlags(Qt.WindowType.FramelessWindowHint)  # No title bar
         self.progress_dialog.setWindowModality(Qt.WindowModality.ApplicationModal)  # Modal
         self.progress_dialog.setAutoClose(True)
@@ -2078,7 +5065,7 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         """)
 
         # Create a custom QLabel for the message with the modpack name
-        label = QLabel(f"Downloading {modpack_name}({selected_branch})...")  # Show the name of the modpack
+        label = QLabel(f"{'Resuming' if resume else 'Downloading'} {modpack_name}({selected_branch})...")  # Show the name of the modpack
         label.setAlignment(Qt.AlignmentFlag.AlignCenter)  # Center-align the text
         label.setStyleSheet("""
             QLabel {
@@ -2102,15 +5089,43 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
 
         QApplication.processEvents()
 
-        self.worker = ModpackDownloadWorker(repo_url, folder_name, selected_branch, force_update=True)
+        clone_strategy = self.settings.get("clone_strategy", DEFAULT_CLONE_STRATEGY)
+        submodule_jobs = self.settings.get("submodule_jobs", DEFAULT_SUBMODULE_JOBS)
+        deduplicate = self.settings.get("deduplicate_mods", True)
+        self.worker = ModpackDownloadWorker(repo_url, folder_name, selected_branch, force_update=True,
+                                            clone_strategy=clone_strategy, submodule_jobs=submodule_jobs, resume=resume,
+                                            repair=os.path.exists(repo_path) and not resume, deduplicate=deduplicate)
+        self.progress_dialog.canceled.connect(self.worker.cancel)
+        self.submodule_states = {}
+        self.worker.submodule_progress.connect(self.show_submodule_progress)
+        self.worker.transfer_progress.connect(lambda event: self.show_transfer_progress(label, f"Downloading {modpack_name}({selected_branch})...", event))
         self.worker.finished.connect(self.on_download_finished)
 
         # Start the worker thread
         self.worker.start()
 
+    def show_transfer_progress(self, label, title, event):
+        """Show a transfer progress event as determinate progress in the progress dialog."""
+        text = f"{title}\n{event['text']}"
+        submodules = format_submodule_states(self.submodule_states)
+        if submodules:
+            text += f"\n{submodules}"
+        label.setText(text)
+        if self.progress_dialog.maximum() == 0:
+            # Switch from the busy indicator to a percentage; keep the dialog open at 100% of a phase
+            self.progress_dialog.setAutoClose(False)
+            self.progress_dialog.setAutoReset(False)
+            self.progress_dialog.setRange(0, 100)
+        self.progress_dialog.setValue(event["percent"])
+
+    def show_submodule_progress(self, event):
+        """Track the latest event of each submodule; show_transfer_progress lists them under the overall progress."""
+        self.submodule_states[event["path"]] = event
+
     def on_download_finished(self, success, message):
         # Close the progress dialog
         self.progress_dialog.close()
+        self.resume_pending_deletions()  # A re-download moves the old folder aside
 
         # Show the result message (success or failure)
         msg_box = QMessageBox()
@@ -2131,7 +5146,7 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         """Fetch the latest tag message from the Coonie's Modpack GitHub repository."""
         try:
             api_url = "https://api.github.com/repos/GayCoonie/Coonies-Mod-Pack/tags"
-            response = requests.get(api_url)
+            response = http_get(api_url)
             if response.status_code == 200:
                 tags = response.json()
                 if tags:
@@ -2235,7 +5250,13 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         QApplication.processEvents()
 
         # Create the worker for updating the modpack
-        self.worker = ModpackUpdateWorker(repo_url, repo_name, selected_branch, parent_folder)
+        clone_strategy = self.settings.get("clone_strategy", DEFAULT_CLONE_STRATEGY)
+        submodule_jobs = self.settings.get("submodule_jobs", DEFAULT_SUBMODULE_JOBS)
+        deduplicate = self.settings.get("deduplicate_mods", True)
+        self.worker = ModpackUpdateWorker(repo_url, repo_name, selected_branch, parent_folder, clone_strategy, submodule_jobs, deduplicate)
+        self.submodule_states = {}
+        self.worker.submodule_progress.connect(self.show_submodule_progress)
+        self.worker.transfer_progress.connect(lambda event: self.show_transfer_progress(label, f"Updating {modpack_name}({selected_branch})...", event))
         self.worker.finished.connect(self.on_update_finished)
 
         # Start the worker (background task)
@@ -2321,7 +5342,7 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
                 self.install_mods(None)  # Pass None as we don't have a popup
             else:
                 # Show mod selection popup
-                self.popup_mod_selection(mod_list, dependencies)
+                self.popup_mod_selection(mod_list, self.dependencies)
 
         except Exception as e:
             QMessageBox.critical(
@@ -2364,9 +5385,9 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         splitter = QSplitter(popup)
         splitter.setOrientation(Qt.Orientation.Horizontal)
 
-        # Extract unique genres and tags from metadata
-        genres = sorted(set(info['Genre'] for info in self.metadata.values()))
-        tags = sorted({tag for info in self.metadata.values() for tag in info['Tags']})
+        # Unique genres and tags, precomputed in the metadata index
+        genres = self.mod_genres
+        tags = self.mod_tags
 
         # Left panel (Filters)
         left_panel = QWidget()
@@ -2457,6 +5478,7 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
             mod_row_container.mousePressEvent = show_context_menu
 
         mod_vars = []  # Clear any existing data
+        mod_sizes = load_install_stats()["mods"]  # Measured by the last install plan that included each mod
 
         def toggle_favorite(label, mod):
             """Toggle favorite state for the given mod."""
@@ -2499,6 +5521,8 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
             
             # Combine metadata into a tooltip text
             tooltip_text = f"<b>Genre:</b> {genre}<br><b>Tags:</b> {tags}<br><b>Description:</b> {description}"
+            if mod in mod_sizes:
+                tooltip_text += f"<br><b>Size:</b> {format_bytes(mod_sizes[mod][0])} in {mod_sizes[mod][1]} file(s)"
             
             # Set the tooltip for the checkbox
             mod_checkbox.setToolTip(tooltip_text)
@@ -2830,6 +5854,7 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
             mods_dir = os.path.abspath(os.path.expandvars(self.mods_dir))
 
         # Check if the Mods directory exists
+        backup_folder = None
         if os.path.isdir(mods_dir):
             # Determine if backup is enabled
             backup_mods = self.settings.get("backup_mods", False)
@@ -2837,123 +5862,185 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
                 backup_mods = self.backup_checkbox.isChecked()
 
             if backup_mods:
-                # Create a timestamped backup folder name
+                # The replaced install is moved here when the new one is swapped in, instead of becoming a generation
                 timestamp = time.strftime("%Y%m%d-%H%M%S")
                 backup_folder = os.path.join(os.path.dirname(mods_dir), f"Mods-backup-{timestamp}")
 
-                try:
-                    # Move the Mods directory to the backup folder
-                    shutil.move(mods_dir, backup_folder)
-                    QMessageBox.information(
-                        self, 
-                        "Backup Successful", 
-                        f"Mods folder successfully backed up to:\n{backup_folder}"
-                    )
-                except Exception as e:
-                    # Show error message if backup fails
-                    QMessageBox.critical(self, "Error", f"Failed to backup Mods folder. Error: {str(e)}")
-                    return
-
-            # Remove existing mods folder if enabled
-            remove_mods = self.settings.get("remove_mods", False)
-            if hasattr(self, 'remove_checkbox'):  # Use checkbox if available
-                remove_mods = self.remove_checkbox.isChecked()
+        # Remove everything else from the mods folder if enabled
+        remove_mods = self.settings.get("remove_mods", False)
+        if hasattr(self, 'remove_checkbox'):  # Use checkbox if available
+            remove_mods = self.remove_checkbox.isChecked()
 
-            if remove_mods:
-                # Platform-specific path resolution
-                if system_platform == "Darwin":  # macOS
-                    mods_dir = os.path.abspath(os.path.expanduser(self.mods_dir))
-                elif system_platform == "Windows" or "Linux":
-                    mods_dir = os.path.abspath(os.path.expandvars(self.mods_dir))
-
-                # Warning message box
-                msg_box = QMessageBox()
-                msg_box.setIcon(QMessageBox.Icon.Warning)
-                msg_box.setWindowTitle("Warning")
-                msg_box.setText("The current 'Mods' folder will be erased. Do you want to proceed?")
-                msg_box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-                response = msg_box.exec()
-
-                if response == QMessageBox.StandardButton.No:
-                    return
+        if remove_mods and os.path.isdir(mods_dir):
+            # Warning message box
+            msg_box = QMessageBox()
+            msg_box.setIcon(QMessageBox.Icon.Warning)
+            msg_box.setWindowTitle("Warning")
+            msg_box.setText("Everything in the current 'Mods' folder that is not part of this modpack will be erased. Do you want to proceed?")
+            msg_box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            response = msg_box.exec()
 
-                try:
-                    # Remove the Mods directory
-                    if os.path.exists(mods_dir):
-                        shutil.rmtree(mods_dir, ignore_errors=True)
-                        QMessageBox.information(self, "Success", "The 'Mods' folder has been removed successfully.")
-                    else:
-                        QMessageBox.warning(self, "Warning", "The 'Mods' folder does not exist.")
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"Failed to remove Mods folder. Error: {str(e)}")
+            if response == QMessageBox.StandardButton.No:
+                return
 
         # Create a progress dialog
-        progress_dialog = QProgressDialog("Installing mods...", "Cancel", 0, 100, self)
-        progress_dialog.setWindowTitle("Installation Progress")
-        progress_dialog.setWindowModality(Qt.WindowModality.ApplicationModal)
-        progress_dialog.setMinimumDuration(0)
-        progress_dialog.setValue(0)
+        self.install_dialog = QProgressDialog("Checking mods...", "Cancel", 0, 100, self)
+        self.install_dialog.setWindowTitle("Installation Progress")
+        self.install_dialog.setWindowModality(Qt.WindowModality.ApplicationModal)
+        self.install_dialog.setMinimumDuration(0)
+        self.install_dialog.setAutoClose(False)
+        self.install_dialog.setAutoReset(False)
+        self.install_dialog.setValue(0)
 
         # Always install "Steamodded" and "ModpackUtil"
         mandatory_mods = {"Steamodded", "ModpackUtil"}
         all_mods = mandatory_mods.union(set(os.listdir(mods_src)))
         filtered_mods = [mod for mod in all_mods if mod not in excluded_mods or mod in mandatory_mods]
 
-        try:
-            # Resolve mods directory based on platform
-            if system_platform == "Darwin":  # macOS
-                mods_dir = os.path.abspath(os.path.expanduser(self.mods_dir))
-            elif system_platform == "Windows" or "Linux":
-                mods_dir = os.path.abspath(os.path.expandvars(self.mods_dir))
-
-            # Iterate through mods and copy them
-            total_mods = len(filtered_mods)
-            for index, mod in enumerate(filtered_mods, start=1):
-                source_mod_path = os.path.join(mods_src, mod)
-                destination_mod_path = os.path.join(mods_dir, mod)
-
-                # Update progress dialog
-                progress_percentage = int((index / total_mods) * 100)
-                progress_dialog.setValue(progress_percentage)
-                progress_dialog.setLabelText(f"Copying mod: {mod} ({index}/{total_mods})")
-                QApplication.processEvents()  # Keep the UI responsive
-
-                # Handle user cancellation
-                if progress_dialog.wasCanceled():
-                    QMessageBox.warning(self, "Installation Canceled", "The installation process was canceled.")
-                    return
+        # Plan the install off the GUI thread first; the same plan is executed once the summary is confirmed
+        install_mode = self.settings.get("install_mode", DEFAULT_INSTALL_MODE)
+        ignore = load_ignore_table(self.settings.get("install_ignore", DEFAULT_INSTALL_IGNORE), repo_path)
+        # Each modpack folder keeps its own install, so switching back to one only writes what changed
+        self.install_plan_worker = ModInstallPlanWorker(mods_src, mods_dir, filtered_mods, mirror=remove_mods, install_mode=install_mode,
+                                                        ignore=ignore, pack=os.path.basename(repo_path))
+        self.install_dialog.canceled.connect(self.install_plan_worker.cancel)
+        self.install_plan_worker.progress.connect(self.show_install_progress)
+        self.install_plan_worker.finished.connect(
+            lambda success, message: self.on_install_planned(success, message, mods_dir, backup_folder, popup))
+        self.install_plan_worker.start()
+
+    def on_install_planned(self, success, message, mods_dir, backup_folder, popup):
+        """Show the dry-run summary of the planned install, and execute the plan once confirmed."""
+        plan = self.install_plan_worker.plan
+        if not success:
+            self.install_dialog.close()
+            if plan and plan["cancelled"]:
+                QMessageBox.warning(self, "Installation Canceled", message)
+            else:
+                QMessageBox.critical(self, "Error", message)
+            return
 
-                # Perform the copy operation
-                try:
-                    if os.path.exists(destination_mod_path):
-                        shutil.rmtree(destination_mod_path)
-                    shutil.copytree(source_mod_path, destination_mod_path)
-                except Exception as copy_error:
-                    QMessageBox.warning(self, "Copy Error", f"Failed to copy {mod}. Error: {copy_error}")
+        self.install_dialog.hide()
+        if not install_plan_changes(plan):
+            self.install_dialog.close()
+            if plan["failed"]:
+                QMessageBox.warning(self, "Install Status", f"Your Mods folder is up to date, but {len(plan['failed'])} mod(s) "
+                                                            f"could not be checked:\n\n{format_install_errors(plan['failed'])}")
+            else:
+                QMessageBox.information(self, "Install Status", f"Your Mods folder is already up to date ({plan['unchanged']} unchanged).")
+            self.finish_install(mods_dir, popup)
+            return
 
-            # Close the progress dialog
-            progress_dialog.close()
+        free_space = free_disk_space(mods_dir)
+        summary = format_install_plan(plan, free_space, estimate_install_seconds(plan))
+        needed = install_space_needed(plan)
+        if free_space is not None and needed and free_space < needed + FREE_SPACE_MARGIN:
+            self.install_dialog.close()
+            QMessageBox.critical(self, "Not Enough Disk Space", f"{summary}\n\nFree up disk space on the Mods drive, "
+                                                               "or switch to a link install mode in Settings, and try again.")
+            return
 
-            # Show installation success message
-            QMessageBox.information(self, "Install Status", "Successfully installed modpack.")
+        msg_box = QMessageBox(self)
+        msg_box.setIcon(QMessageBox.Icon.Question)
+        msg_box.setWindowTitle("Confirm Install")
+        msg_box.setText(f"{summary}\n\nDo you want to proceed?")
+        msg_box.setDetailedText(format_install_plan_details(plan))
+        msg_box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if msg_box.exec() != QMessageBox.StandardButton.Yes:
+            self.install_dialog.close()
+            return
 
-        except Exception as e:
-            progress_dialog.close()
-            QMessageBox.critical(self, "Error", f"An error occurred during installation: {e}")
+        # Build the install next to the Mods folder off the GUI thread, then swap it in
+        generations = self.settings.get("install_generations", DEFAULT_INSTALL_GENERATIONS)
+        self.install_worker = ModInstallWorker(plan, mods_dir, generations=generations, backup_path=backup_folder)
+        self.install_dialog.canceled.disconnect(self.install_plan_worker.cancel)  # Keeps the dialog's own canceled->cancel
+        self.install_dialog.canceled.connect(self.install_worker.cancel)
+        self.install_dialog.setLabelText("Installing mods...")
+        self.install_dialog.setValue(0)
+        self.install_dialog.show()
+        self.install_worker.progress.connect(self.show_install_progress)
+        self.install_worker.finished.connect(lambda success, message: self.on_install_finished(success, message, mods_dir, popup))
+        self.install_worker.start()
+
+    def show_install_progress(self, event):
+        self.install_dialog.setLabelText(event["text"])
+        self.install_dialog.setValue(event["percent"])
+
+    def on_install_finished(self, success, message, mods_dir, popup):
+        self.install_dialog.close()
+        report = self.install_worker.report
+
+        if report and report["cancelled"]:
+            QMessageBox.warning(self, "Installation Canceled", message)
+        elif success:
+            QMessageBox.information(self, "Install Status", message)
+        elif report:
+            QMessageBox.warning(self, "Install Status", message)
+        else:
+            QMessageBox.critical(self, "Error", message)
+        self.finish_install(mods_dir, popup)
 
-        finally:
-            # Ensure mods_path is updated and debug folders are removed
-            if system_platform == "Darwin":  # macOS
-                mods_path = os.path.abspath(os.path.expanduser(self.settings.get("mods_directory")))
-            elif system_platform == "Windows" or "Linux":
-                mods_path = os.path.abspath(os.path.expandvars(self.settings.get("mods_directory")))
+    def finish_install(self, mods_dir, popup):
+        # Remove debug folders from the mods directory
+        if os.path.isdir(mods_dir):
+            remove_debug_folders(mods_dir)
+        self.update_installed_info()
+        self.resume_pending_deletions()  # Pruned generations and mods removed from the install
 
-            remove_debug_folders(mods_path)
+        # Ensure the installation popup is closed
+        if popup:
+            self.install_popup_open = False
+            popup.close()
 
-            # Ensure the installation popup is closed
-            if popup:
-                self.install_popup_open = False
-                popup.close()
+    def show_install_menu(self, position):
+        menu = QMenu(self.install_button)
+        rollback_action = menu.addAction("Roll Back to Previous Install")
+        rollback_action.setEnabled(bool(install_generations(self.resolve_mods_dir())))
+        rollback_action.triggered.connect(self.rollback_to_previous_install)
+
+        switch_menu = menu.addMenu("Switch to Installed Pack")
+        parked = pack_trees(self.resolve_mods_dir())
+        switch_menu.setEnabled(bool(parked))
+        for pack in parked:
+            switch_menu.addAction(pack).triggered.connect(lambda _, pack=pack: self.switch_installed_pack(pack))
+        menu.exec(self.install_button.mapToGlobal(position))
+
+    def switch_installed_pack(self, pack):
+        """Make the kept install of another modpack live with renames; the current one is kept in turn."""
+        try:
+            switch_pack_tree(self.resolve_mods_dir(), pack)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to switch to {pack}: {e}\nClose the game and try again.")
+            return
+        self.update_installed_info()
+        QMessageBox.information(self, "Switch Pack", f"Switched to the installed copy of {pack}.\n"
+                                                     "Install it again to pick up updates or a changed mod selection.")
+
+    def resolve_mods_dir(self):
+        if system_platform == "Darwin":  # macOS
+            return os.path.abspath(os.path.expanduser(self.settings.get("mods_directory")))
+        return os.path.abspath(os.path.expandvars(self.settings.get("mods_directory")))
+
+    def rollback_to_previous_install(self):
+        """Swap the previous install back in; rolling back again returns to the current one."""
+        mods_dir = self.resolve_mods_dir()
+        generations = install_generations(mods_dir)
+        if not generations:
+            QMessageBox.information(self, "Rollback", "No previous install is available.")
+            return
+
+        response = QMessageBox.question(self, "Rollback", f"Replace the current Mods folder with the previous install?\n{generations[0]}",
+                                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if response != QMessageBox.StandardButton.Yes:
+            return
+
+        try:
+            restored = rollback_install(mods_dir)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to roll back: {e}\nClose the game and try again.")
+            return
+        self.update_installed_info()
+        QMessageBox.information(self, "Rollback", f"Restored the install from {os.path.basename(restored)}.\nRoll back again to undo.")
 
     def save_and_install(self, mod_vars, popup):
         self.save_preferences(mod_vars)
@@ -2972,14 +6059,20 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         msg_box.setIcon(QMessageBox.Icon.Question)
         msg_box.setWindowTitle("Confirm Uninstallation")
         msg_box.setText("Are you sure you want to uninstall the modpack? This action cannot be undone.")
+        parked = pack_trees(install_path)
+        if parked:
+            msg_box.setInformativeText(f"The installed copies of {', '.join(parked)} kept for switching are deleted as well.")
         msg_box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         msg_box.setDefaultButton(QMessageBox.StandardButton.No)
 
         # Show the confirmation dialog and proceed if Yes is clicked
         if msg_box.exec() == QMessageBox.StandardButton.Yes:
             try:
-                if os.path.exists(install_path):
-                    shutil.rmtree(install_path, onerror=readonly_handler)
+                if os.path.exists(install_path) or parked:
+                    if os.path.exists(install_path):
+                        self.delete_in_background(install_path)
+                    for path in parked.values():
+                        self.delete_in_background(path)
 
                     # Show success message
                     success_box = QMessageBox()
@@ -3006,32 +6099,36 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
 # Bottom functions (Check versions, lovely, browser links)
 ############################################################
 
-    # Function to check if a folder is empty or contains only a '.git' directory
-    def is_empty_or_git_only(self, folder_path):
+    # Function to check if a folder has nothing that would be installed: empty, or only '.git' and other ignored files
+    def is_empty_or_git_only(self, folder_path, patterns=(), rel_path=""):
         try:
-            # Get list of files/folders in the current directory, excluding hidden files
-            items = [item for item in os.listdir(folder_path) if not item.startswith('.')]
-            if len(items) == 0:
-                return True  # Folder is empty
-            if len(items) == 1 and items[0] == '.git':
-                return True  # Folder contains only .git
-            return False
+            # Get list of files/folders in the current directory, excluding hidden and ignored ones
+            prefix = rel_path + "/" if rel_path else ""
+            items = [item for item in os.listdir(folder_path) if not item.startswith('.') and not is_ignored(prefix + item, patterns)]
+            return len(items) == 0
         except Exception as e:
             print(f"Error while processing {folder_path}: {str(e)}")
             return False
 
-    # Function to list all empty or git-only folders
-    def list_empty_or_git_only_folders(self, root_folder):
+    # Function to list all empty or git-only folders, skipping folders the install ignores
+    def list_empty_or_git_only_folders(self, root_folder, ignore=None):
         empty_or_git_only_folders = []
-        for dirpath, _, _ in os.walk(root_folder):
-            if self.is_empty_or_git_only(dirpath):
+        for dirpath, dirnames, _ in os.walk(root_folder):
+            rel_dir = os.path.relpath(dirpath, root_folder).replace(os.sep, "/")
+            mod, _, in_mod = ("" if rel_dir == "." else rel_dir).partition("/")
+            patterns = mod_ignore_patterns(ignore, mod)
+            prefix = in_mod + "/" if in_mod else ""
+            if mod:
+                dirnames[:] = [name for name in dirnames if not is_ignored(prefix + name, patterns)]
+            if self.is_empty_or_git_only(dirpath, patterns if mod else (), in_mod):
                 empty_or_git_only_folders.append(os.path.basename(dirpath))  # Append folder name, not full path
         return empty_or_git_only_folders
 
     # Verification function for a specific modpack folder
     def verify_modpack_folder(self, modpack_folder):
         print(f"Verifying modpack folder: {modpack_folder}")
-        self.list_empty_or_git_only_folders(modpack_folder)
+        ignore = load_ignore_table(self.settings.get("install_ignore", DEFAULT_INSTALL_IGNORE), os.path.dirname(modpack_folder))
+        self.list_empty_or_git_only_folders(modpack_folder, ignore)
 
     # Function to verify the integrity of the 'Mods' folder of the currently selected modpack
     def verify_modpack_integrity(self):
@@ -3059,8 +6156,9 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
             )
             return
 
-        # Call the verification function to get the list of empty or .git-only folders
-        empty_or_git_only_folders = self.list_empty_or_git_only_folders(modpack_folder)
+        # Call the verification function to get the list of folders with nothing to install
+        ignore = load_ignore_table(self.settings.get("install_ignore", DEFAULT_INSTALL_IGNORE), os.path.dirname(modpack_folder))
+        empty_or_git_only_folders = self.list_empty_or_git_only_folders(modpack_folder, ignore)
 
         # Show the result in a message box
         if empty_or_git_only_folders:
@@ -3142,7 +6240,7 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
         """Fetch the latest tag name from the Coonie's Modpack GitHub repository."""
         try:
             api_url = "https://api.github.com/repos/GayCoonie/Coonies-Mod-Pack/tags"
-            response = requests.get(api_url)
+            response = http_get(api_url)
             if response.status_code == 200:
                 tags = response.json()
                 if tags:
@@ -3211,7 +6309,7 @@ class ModpackManagerApp(QWidget):  # or QMainWindow
 
         # Download and extract the archive
         try:
-            response = requests.get(url, stream=True)
+            response = http_get(url, stream=True)
             response.raise_for_status()
 
             with open(archive_path, "wb") as file:
@@ -3323,6 +6421,7 @@ if __name__ == "__main__":
 
     app = QApplication([])  # Initialize the QApplication
 
+    profiler.add_span("module setup", profiler.origin, time.perf_counter() - profiler.origin)
     root = ModpackManagerApp()  # No need to pass 'root', since the window is handled by PyQt itself
 
     # Set global stylesheet to apply a 1pt gray border to all QPushButtons